@@ -22,14 +22,82 @@ WORK_TRIGGERS = [
     "hypothesis", "fidelity", "spiral path", "doi", "audit", "tricorder", "helix"
 ]
 
-def classify_input(text: str) -> ThemeSignal:
-    t = text.lower()
+_DEFAULT_FLAGS = re.compile("").flags
+
+def _combinable(regex) -> bool:
+    """
+    Safe to splice into a shared alternation: no groups (so no backreferences
+    to renumber) and no global inline flags like (?i) that only work up front.
+    """
+    return regex.groups == 0 and regex.flags == _DEFAULT_FLAGS
+
+class TriggerMatcher:
+    """
+    Trigger sets behind one combined pattern. Each trigger is compiled on its
+    own; those that can share an alternation (see _combinable) are also joined
+    into a single gate, scanned once per input. Most inputs hit nothing and
+    stop there. Otherwise exact per-set counts come from the per-trigger
+    patterns, searched from the gate's first hit onwards (no combined trigger
+    can match earlier). Triggers that can't be combined are always searched
+    on their own. Semantics match re.search per regex trigger and substring
+    tests per work keyword, case-sensitive as written.
+    """
+
+    def __init__(self, blocked, play, work):
+        self.key = (tuple(blocked), tuple(play), tuple(work))
+        self.blocked = [(r, _combinable(r)) for r in map(re.compile, blocked)]
+        self.play = [(r, _combinable(r)) for r in map(re.compile, play)]
+        self.work = list(work)
+        combined = [r.pattern for r, ok in self.blocked + self.play if ok] + [re.escape(k) for k in work]
+        self.pattern = re.compile("|".join(f"(?:{p})" for p in combined)) if combined else None
+        self.always = not all(ok for _, ok in self.blocked + self.play)
+
+    @staticmethod
+    def _hits(triggers, t, pos):
+        # pos None: the gate found nothing, so only uncombined triggers can still match
+        for r, ok in triggers:
+            if not ok:
+                yield r.search(t) is not None
+            elif pos is not None:
+                yield r.search(t, pos) is not None
+
+    def counts(self, t: str, full: bool = True) -> dict:
+        """
+        Distinct triggers hit per set: {'blocked': n, 'play': n, 'work': n}.
+        With full=False counting stops at the first blocked hit (reported as
+        blocked=1, the rest 0), which is all classification needs.
+        """
+        m = self.pattern.search(t) if self.pattern is not None else None
+        if m is None and not self.always:
+            return {"blocked": 0, "play": 0, "work": 0}
+        pos = None if m is None else m.start()
+        if full:
+            blocked = sum(self._hits(self.blocked, t, pos))
+        elif any(self._hits(self.blocked, t, pos)):
+            return {"blocked": 1, "play": 0, "work": 0}
+        else:
+            blocked = 0
+        return {
+            "blocked": blocked,
+            "play": sum(self._hits(self.play, t, pos)),
+            "work": 0 if pos is None else sum(1 for k in self.work if k in t)
+        }
 
-    if any(re.search(p, t) for p in BLOCKED_TRIGGERS):
+_matcher = None
+
+def trigger_matcher() -> TriggerMatcher:
+    """Compiled matcher for the current trigger lists (rebuilt if they were edited)."""
+    global _matcher
+    key = (tuple(BLOCKED_TRIGGERS), tuple(PLAY_TRIGGERS), tuple(WORK_TRIGGERS))
+    if _matcher is None or _matcher.key != key:
+        _matcher = TriggerMatcher(BLOCKED_TRIGGERS, PLAY_TRIGGERS, WORK_TRIGGERS)
+    return _matcher
+
+def _signal(counts: dict) -> ThemeSignal:
+    if counts["blocked"]:
         return ThemeSignal("blocked", "Holy-war/ideological theme", "See CONTEXT_STRING_GUIDELINES.md §3.1")
 
-    play_score = sum(bool(re.search(p, t)) for p in PLAY_TRIGGERS)
-    work_score = sum(k in t for k in WORK_TRIGGERS)
+    play_score, work_score = counts["play"], counts["work"]
 
     if play_score > 0 and work_score == 0:
         return ThemeSignal("play", "Narrative theme", "playground/dune/")
@@ -40,7 +108,22 @@ def classify_input(text: str) -> ThemeSignal:
     else:
         return ThemeSignal("work", "Default: assume inquiry", "core_tricorder")
 
-def log_classification(signal: ThemeSignal, input_text: str, user_bypass: bool = False):
+def classify_input(text: str) -> ThemeSignal:
+    return _signal(trigger_matcher().counts(text.lower(), full=False))
+
+def classify_batch(texts) -> list:
+    """
+    Classify many inputs with one matcher lookup for the whole batch.
+    Same results as [classify_input(t) for t in texts].
+    """
+    counts = trigger_matcher().counts
+    return [_signal(counts(text.lower(), False)) for text in texts]
+
+def log_classification(signal: ThemeSignal, input_text: str, user_bypass: bool = False, writer=None):
+    """
+    Append a provenance entry: JSONL by default, or to `writer` when given
+    (anything with .append(entry), e.g. provenance_store.ProvenanceWriter(path, "theme")).
+    """
     entry = {
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "input_hash": __import__('hashlib').sha256(input_text.encode()).hexdigest()[:12],
@@ -49,6 +132,9 @@ def log_classification(signal: ThemeSignal, input_text: str, user_bypass: bool =
         "redirect": signal.redirect,
         "user_bypass": user_bypass
     }
+    if writer is not None:
+        writer.append(entry)
+        return
     log_file = "play_log.jsonl" if "play" in signal.type else "audit_helix_log.jsonl"
     with open(log_file, "a") as f:
         f.write(json.dumps(entry) + "\n")
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+import streamlit.components.v1 as components
 import pandas as pd  # For CSV export & tables
 import tavis_spiral  # Direct kin-call: Same-folder sibling, no package pacts
+import sim_cache  # On-disk result cache: identical configs return instantly
+import tavis_spectral  # Batched FFT/envelope analysis for the cross-checks
+import tavis_render  # Decimated Agg animation pipeline (HTML/GIF artifacts)
 
 st.set_page_config(page_title="Spiral Tavis-Cummings Demo", layout="wide")
 st.title("🌀 Spiral-Modulated Quantum Cavity Simulator")
@@ -28,6 +30,21 @@ num_atoms = st.sidebar.radio("Atoms", [1, 2])
 spiral_mode = st.sidebar.checkbox("Activate Spiral Surprises", value=False)
 n_times = st.sidebar.slider("Time Steps", 200, 1000, 500)
 cav_dim = st.sidebar.slider("Cavity Dim", 3, 10, 5)
+anim_frames = st.sidebar.slider("Animation Frames", 30, 240, 120)
+
+def animation_future(key, frames, res, params):
+    # One render per (params, frames) per session, on tavis_render's worker thread; the Future
+    # lives in session_state so reruns pick up the finished artifact instead of waiting on it
+    renders = st.session_state.setdefault('renders', {})
+    if (key, frames) not in renders:
+        renders[(key, frames)] = tavis_render.render_async(res, params, frames=frames, fmt='html')
+        while len(renders) > 8:
+            renders.pop(next(iter(renders)))
+    return renders[(key, frames)]
+
+@st.cache_resource
+def get_cache():
+    return sim_cache.SimCache()  # One per server, so hit/miss stats survive reruns
 
 params = {
     'omega_0': omega_0, 'omega_c': omega_c, 'g_base': g_base, 'T': T, 'D': D,
@@ -36,13 +53,18 @@ params = {
 }
 
 if st.sidebar.button("🔥 Unleash the Spiral!"):
+    st.session_state['unleashed'] = params  # Survives reruns (downloads, the render landing)
+if st.session_state.get('unleashed') == params:
     with st.spinner("Coiling the cavity..."):
-        res = tavis_spiral.simulate_rabi_spiral(params)
+        cache = get_cache()
+        res = cache.run(params)
         mark = res['spiral_mark']
     
     # Sidebar Sigil
     st.sidebar.markdown(f"**Mark:** {mark}")
     st.sidebar.markdown("**Std <n>:** {:.3f}".format(res['std_n']))
+    stats = cache.stats
+    st.sidebar.markdown(f"**Cache:** {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} entries)")
 
     # Verifiable Metrics: Expander for quick checks
     with st.expander("📊 Key Metrics (Cross-Check Your Calcs)"):
@@ -69,21 +91,39 @@ if st.sidebar.button("🔥 Unleash the Spiral!"):
         }
         st.table(metrics)
 
-    # Baseline Comparison: Standard JC (constant g=0.2, no R(t)/spiral)
-    with st.expander("🔍 Standard JC Baseline (QuTiP, for Verification)"):
+    # Baseline Comparison: Standard JC (constant g = g_base, no R(t)/spiral), exact for these params
+    with st.expander("🔍 Standard JC Baseline (Exact, for Verification)"):
+        jc_P_e, _, jc_n = tavis_spiral.jc_exact(dict(params, omega=0.0, C=1.0, hbar=1.0), res['tlist'])
+        mid = len(res['tlist']) // 2
+        t_mid, t_end = res['tlist'][mid], res['tlist'][-1]
         baseline = pd.DataFrame({
-            "Metric": ["P_e (t=0)", "P_e (t=10)", "P_e (t=20)", "<n> (t=10)", "<n> (t=20)", "Std <n> (full)"],
-            "Standard JC Value": ["1.000", "0.176", "0.427", "0.824", "0.573", "0.345"],
-            "Your Modulated Value": [f"{res['P_single_e'][0]:.3f}", f"{res['P_single_e'][250]:.3f}", f"{res['P_single_e'][-1]:.3f}", f"{res['n'][250]:.3f}", f"{res['n'][-1]:.3f}", f"{res['std_n']:.3f}"]
+            "Metric": ["P_e (t=0)", f"P_e (t={t_mid:.0f})", f"P_e (t={t_end:.0f})", f"<n> (t={t_mid:.0f})", f"<n> (t={t_end:.0f})", "Std <n> (full)"],
+            "Standard JC Value": [f"{v:.3f}" for v in (jc_P_e[0], jc_P_e[mid], jc_P_e[-1], jc_n[mid], jc_n[-1], np.std(jc_n))],
+            "Your Modulated Value": [f"{res['P_single_e'][0]:.3f}", f"{res['P_single_e'][mid]:.3f}", f"{res['P_single_e'][-1]:.3f}", f"{res['n'][mid]:.3f}", f"{res['n'][-1]:.3f}", f"{res['std_n']:.3f}"]
         })
         st.table(baseline)
 
+    # Spectral Cross-Check: measured Rabi frequency vs the static block's dominant transition, collapse/revival, decay
+    with st.expander("🎼 Spectral Cross-Check (Rabi Freq, Collapse/Revival)"):
+        spectra = tavis_spectral.analyze(res)
+        expected = tavis_spectral.expected_rabi_frequency(params, res['R_t'])[0]
+        st.table({
+            key: {
+                "Dominant ω": f"{stats['dominant_frequency'][0]:.3f}",
+                "Expected Rabi ω": f"{expected:.3f}",
+                "Collapse t": f"{stats['collapse_time'][0]:.2f}",
+                "Revival t": f"{stats['revival_time'][0]:.2f}",
+                "Envelope decay γ": f"{stats['decay_rate'][0]:.4f}"
+            }
+            for key, stats in spectra.items()
+        })
+
     # CSV Export: Full data for verification
     df = pd.DataFrame({
         't': res['tlist'],
         'P_single_e': res['P_single_e'],
         'n': res['n'],
-        'R_t': [tavis_spiral.define_R(tt, params) for tt in res['tlist']]  # Full R(t) series
+        'R_t': res['R_t']  # Full R(t) series, cached on the result
     })
     if num_atoms == 2:
         df['P_ee'] = res['P_ee']
@@ -95,60 +135,32 @@ if st.sidebar.button("🔥 Unleash the Spiral!"):
         mime='text/csv'
     )
 
-    # Canvas: Three columns for plots
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.subheader("Excitation Entanglements")
-        fig1, ax1 = plt.subplots(figsize=(5, 4))
-        line_pe, = ax1.plot([], [], label='P_single_e(t)', color='blue', lw=2)
-        line_pee = None
-        if num_atoms == 2:
-            line_pee, = ax1.plot([], [], label='P_ee(t)', color='green', lw=2)
-        ax1.set_xlim(0, T); ax1.set_ylim(0, 1.1)
-        ax1.set_ylabel('P_exc'); ax1.legend(); ax1.grid(alpha=0.3)
-
-        def animate_exc(i):
-            line_pe.set_data(res['tlist'][:i+1], res['P_single_e'][:i+1])
-            if num_atoms == 2 and res['P_ee'] is not None and line_pee is not None:
-                line_pee.set_data(res['tlist'][:i+1], res['P_ee'][:i+1])
-            return (line_pe, line_pee) if line_pee is not None else (line_pe,)
-
-        ani_exc = animation.FuncAnimation(fig1, animate_exc, frames=len(res['tlist']), interval=50, blit=False, repeat=True)
-        st.pyplot(fig1)
-
-    with col2:
-        st.subheader("Photon Gyre")
-        fig2, ax2 = plt.subplots(figsize=(5, 4))
-        line_n, = ax2.plot([], [], label='<n>(t)', color='red', lw=2)
-        ax2.set_xlim(0, T); ax2.set_ylim(0, max(res['n']) * 1.1 or 1.0)
-        ax2.set_ylabel('<n>'); ax2.legend(); ax2.grid(alpha=0.3)
-
-        def animate_n(i):
-            line_n.set_data(res['tlist'][:i+1], res['n'][:i+1])
-            lower = np.maximum(0, res['n'][:i+1] - res['std_n'])
-            upper = res['n'][:i+1] + res['std_n']
-            ax2.fill_between(res['tlist'][:i+1], lower, upper, alpha=0.3, color='red')
-            return (line_n,)
-
-        ani_n = animation.FuncAnimation(fig2, animate_n, frames=len(res['tlist']), interval=50, blit=False, repeat=True)
-        st.pyplot(fig2)
-
-    with col3:
-        st.subheader("Modulator R(t)")
-        fig3, ax3 = plt.subplots(figsize=(5, 4))
-        line_r, = ax3.plot([], [], label='R(t)', color='orange', lw=2)
-        ax3.set_xlim(0, T); ax3.set_ylim(min(0.4, np.min([tavis_spiral.define_R(tt, params) for tt in res['tlist'][:50]])), max(0.6, np.max([tavis_spiral.define_R(tt, params) for tt in res['tlist'][:50]])))
-        ax3.set_ylabel('R(t)'); ax3.set_xlabel('t'); ax3.legend(); ax3.grid(alpha=0.3)
-
-        def animate_r(i):
-            r_vals = [tavis_spiral.define_R(tt, params) for tt in res['tlist'][:i+1]]
-            line_r.set_data(res['tlist'][:i+1], r_vals)
-            return (line_r,)
-
-        ani_r = animation.FuncAnimation(fig3, animate_r, frames=len(res['tlist']), interval=50, blit=False, repeat=True)
-        st.pyplot(fig3)
+    # Canvas: one precomputed, decimated animation, rendered headless off the script thread
+    st.subheader("Excitation Entanglements · Photon Gyre · Modulator R(t)")
+    anim = animation_future(sim_cache.cache_key(params), anim_frames, res, params)
+    pending = not anim.done()
+
+    # Only this fragment polls a pending render, so the sim, tables and cache stats above aren't re-run;
+    # once the artifact lands, a single full rerun redraws the page with polling switched off
+    @st.fragment(run_every=0.5 if pending else None)
+    def show_animation():
+        if not anim.done():
+            st.info("Rendering the gyre in the background—it appears here when ready.")
+        elif pending:
+            st.rerun()
+        else:
+            anim_html = anim.result()
+            components.html(anim_html, height=340)
+            st.download_button(
+                label="🎞️ Download Animation (Self-Contained HTML)",
+                data=anim_html,
+                file_name=f"spiral_tavis_{mark}.html",
+                mime='text/html'
+            )
+
+    show_animation()
 
     # R(t) samples at varied points for visibility (avoids sin=0 zeros)
     sample_ts = [1.25, 3.75, 5.25, 7.75, 10.25]  # π/ω offsets for oscillation
-    varied_R = [tavis_spiral.define_R(tt, params) for tt in sample_ts]
+    varied_R = tavis_spiral.define_R(np.array(sample_ts), params)
     st.markdown("**R(t) Samples (varied t=1.25,3.75,5.25,7.75,10.25):** " + ", ".join([f"{r:.3f}" for r in varied_R]))
@@ -0,0 +1,265 @@
+import os
+import sys
+import json
+import zlib
+import types
+import zipfile
+import hashlib
+import functools
+import numpy as np
+
+try:
+    from . import tavis_spiral
+except ImportError:
+    import tavis_spiral  # Same-folder sibling when run as a script / from demo_app
+
+CACHE_VERSION = 1
+DEFAULT_DIR = os.environ.get('SPIRAL_SIM_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'spiral_path', 'tavis'))
+
+def code_version(func=None):
+    """
+    Short hash of the simulator source plus the module defining `func` (default
+    tavis_spiral.simulate_rabi_spiral), so edits to either invalidate old entries.
+    Functions without a source file (e.g. defined interactively) contribute their code.
+    """
+    digest = hashlib.sha256()
+    module = tavis_spiral if func is None else sys.modules.get(func.__module__)
+    for path in dict.fromkeys([tavis_spiral.__file__, getattr(module, '__file__', None)]):
+        if path is None:
+            try:
+                digest.update(json.dumps(_canonical(func), sort_keys=True).encode())
+            except Unidentifiable:
+                digest.update(repr(func).encode())
+        else:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class Unidentifiable(TypeError):
+    """A param value (e.g. a callable holding arbitrary state) that no key can describe faithfully."""
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+def _code_key(code):
+    """Bytecode, constants (nested code included), names and signature shape; no line numbers."""
+    consts = [_code_key(c) if isinstance(c, types.CodeType) else repr(c) for c in code.co_consts]
+    return [code.co_code.hex(), consts, code.co_names, code.co_varnames, code.co_freevars, code.co_cellvars,
+            code.co_argcount, code.co_kwonlyargcount, code.co_flags]
+
+def _function_key(fn, seen):
+    """
+    Functions are keyed by their compiled code (bytecode, constants and nested
+    code), defaults, closure cell values and the module globals they read,
+    so two lambdas only share a key when they compute the same thing.
+    """
+    if id(fn) in seen:
+        return f"<recursive {fn.__qualname__}>"
+    seen = seen | {id(fn)}
+    used = {name: fn.__globals__[name] for name in sorted(_code_names(fn.__code__)) if name in fn.__globals__}
+    return {'__function__': f"{fn.__module__}.{fn.__qualname__}",
+            'code': hashlib.sha256(json.dumps(_code_key(fn.__code__)).encode()).hexdigest(),
+            'defaults': _canonical(fn.__defaults__, seen),
+            'kwdefaults': _canonical(fn.__kwdefaults__, seen),
+            'closure': [_canonical(cell.cell_contents, seen) for cell in fn.__closure__ or ()],
+            'globals': {name: _canonical(value, seen) for name, value in used.items()}}
+
+def _canonical(value, seen=frozenset()):
+    """
+    JSON-stable form of a param value (NumPy scalars/arrays, functions by code
+    and captured state). Raises Unidentifiable for anything else it can't pin down.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _canonical(v, seen) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v, seen) for v in value]
+    if isinstance(value, np.ndarray):
+        return {'__array__': value.tolist(), 'dtype': str(value.dtype)}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, complex):
+        return {'__complex__': [value.real, value.imag]}
+    if isinstance(value, types.ModuleType):
+        return f"<module {value.__name__}>"
+    if isinstance(value, types.FunctionType):
+        return _function_key(value, seen)
+    if isinstance(value, functools.partial):
+        return {'__partial__': _canonical(value.func, seen), 'args': _canonical(value.args, seen),
+                'keywords': _canonical(value.keywords, seen)}
+    if isinstance(value, (np.ufunc, type)) or (isinstance(value, types.BuiltinFunctionType) and (
+            value.__self__ is None or isinstance(value.__self__, types.ModuleType))):
+        return f"{getattr(value, '__module__', None) or '?'}.{getattr(value, '__qualname__', value.__name__)}"
+    raise Unidentifiable(f"Can't key param value of type {type(value).__name__}")
+
+def cache_key(params, func_name='simulate_rabi_spiral', version=None):
+    """
+    Canonical sha256 key over every param (solver settings included), the
+    simulator entry point and the code version. Floats are serialized with
+    repr precision, so only bit-identical configurations share a key.
+    Returns None when params hold something _canonical can't identify
+    (e.g. a callable object with internal state); such runs bypass the cache.
+    """
+    try:
+        canonical = _canonical(params)
+    except Unidentifiable:
+        return None
+    payload = {'cache': CACHE_VERSION, 'code': version or code_version(), 'func': func_name, 'params': canonical}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def _pack(result):
+    """Result dict -> (arrays for np.savez, JSON meta for everything else)."""
+    arrays, meta = {}, {}
+    for key, value in result.items():
+        if isinstance(value, np.ndarray):
+            arrays[key] = value
+        elif key == 'observables':
+            meta[key] = list(value)
+            arrays.update({f'observables/{name}': np.asarray(v) for name, v in value.items()})
+        else:
+            meta[key] = _canonical(value)
+    arrays['__meta__'] = np.array(json.dumps(meta))
+    return arrays
+
+def _restore(value):
+    """Inverse of _canonical's array/complex tagging for values read back from the JSON meta."""
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return np.array(value['__array__'], dtype=value['dtype'])
+        if '__complex__' in value:
+            return complex(*value['__complex__'])
+        return {k: _restore(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_restore(v) for v in value]
+    return value
+
+def _unpack(npz):
+    meta = _restore(json.loads(str(npz['__meta__'])))
+    result = {key: npz[key] for key in npz.files if key != '__meta__' and not key.startswith('observables/')}
+    for key, value in meta.items():
+        if key == 'observables':
+            result[key] = {name: npz[f'observables/{name}'] for name in value}
+        else:
+            result[key] = value
+    return result
+
+class SimCache:
+    """
+    Size-bounded on-disk LRU cache of simulation results, one .npz per key.
+    Hits touch the file's mtime, and eviction removes the least recently used
+    entries once the directory exceeds max_bytes. Writes go to a temp file and
+    are renamed into place, so a crash never leaves a half-written entry.
+    Args:
+        cache_dir (str): Directory for entries (default: $SPIRAL_SIM_CACHE or ~/.cache/spiral_path/tavis)
+        max_bytes (int): Size bound for the whole cache
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=512 * 2**20):
+        self.cache_dir = cache_dir or DEFAULT_DIR
+        self.max_bytes = max_bytes
+        self._versions = {}  # Per simulator function, hashed once
+        self.hits = self.misses = self.evictions = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.npz')
+
+    def _key(self, params, func):
+        func = func or tavis_spiral.simulate_rabi_spiral
+        if func not in self._versions:
+            self._versions[func] = code_version(func)
+        return cache_key(params, f"{func.__module__}.{func.__qualname__}", self._versions[func])
+
+    def get(self, params, func=None):
+        """Cached result of func(params) (default simulate_rabi_spiral), or None on a miss or uncacheable params."""
+        key = self._key(params, func)
+        if key is None:
+            self.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path) as npz:
+                result = _unpack(npz)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile, zlib.error):
+            self.misses += 1  # Missing or corrupt entry
+            return None
+        os.utime(path)  # LRU recency
+        self.hits += 1
+        return result
+
+    def put(self, params, result, func=None):
+        """Store a result and evict down to max_bytes. Returns the entry path (None if params are uncacheable)."""
+        key = self._key(params, func)
+        if key is None:
+            return None
+        path = self._path(key)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, **_pack(result))
+        os.replace(tmp, path)
+        self.evict()
+        return path
+
+    def run(self, params, func=None):
+        """Return the cached result for params, computing and storing it on a miss."""
+        func = func or tavis_spiral.simulate_rabi_spiral
+        result = self.get(params, func)
+        if result is None:
+            result = func(params)
+            self.put(params, result, func)
+        return result
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npz'):
+                st = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        return sorted(entries)
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        for _, _, name in self._entries():
+            os.remove(os.path.join(self.cache_dir, name))
+
+    @property
+    def stats(self):
+        """Hit/miss/eviction counters plus current entry count and size."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(entries), 'bytes': sum(size for _, size, _ in entries)}
+
+# Quick Demo
+if __name__ == "__main__":
+    import time
+    cache = SimCache()
+    params = {
+        'omega_0': 1.0, 'omega_c': 1.0, 'g_base': 0.2, 'T': 20.0, 'D': 1.5,
+        'omega': 2 * np.pi, 'lambda_decay': 0.1, 'C': 0.5, 'hbar': 1.0,
+        'n_times': 500, 'cav_dim': 5, 'num_atoms': 2, 'spiral_mode': True
+    }
+    for label in ('cold', 'warm'):
+        start = time.perf_counter()
+        res = cache.run(params)
+        print(f"{label}: {time.perf_counter() - start:.4f}s, std_n = {res['std_n']:.3f}")
+    print("Stats:", cache.stats)
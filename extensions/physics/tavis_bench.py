@@ -0,0 +1,137 @@
+import json
+import time
+import itertools
+import tracemalloc
+import numpy as np
+
+try:
+    from . import tavis_spiral
+except ImportError:
+    import tavis_spiral  # Same-folder sibling when run as a script
+
+BASE_PARAMS = {
+    'omega_0': 1.0, 'omega_c': 1.0, 'g_base': 0.2, 'T': 20.0, 'D': 1.5,
+    'omega': 2 * np.pi, 'lambda_decay': 0.1, 'C': 0.5, 'hbar': 1.0
+}
+
+# Solver settings under test: name -> params overrides
+SOLVERS = {
+    'RK45': {'solver': 'RK45', 'rtol': 1e-8, 'atol': 1e-9},
+    'RK45-loose': {'solver': 'RK45', 'rtol': 1e-6, 'atol': 1e-8},
+    'DOP853': {'solver': 'DOP853', 'rtol': 1e-10, 'atol': 1e-12},
+    'magnus2': {'solver': 'propagator', 'magnus_order': 2},
+    'magnus4': {'solver': 'propagator', 'magnus_order': 4},
+}
+
+MATRIX = {
+    'num_atoms': [1, 2, 8],
+    'cav_dim': [5, 20],
+    'n_times': [500, 5000],
+    'spiral_mode': [False, True],
+    'solver': list(SOLVERS),
+}
+
+# Absolute limits every case must meet, and allowed slowdowns against a baseline run
+THRESHOLDS = {'max_error': 1e-4, 'modulated_error': 1e-3, 'norm_drift': 1e-4, 'time_ratio': 1.5, 'nfev_ratio': 1.2}
+REFERENCE = {'solver': 'DOP853', 'rtol': 1e-12, 'atol': 1e-13}  # Modulated-problem reference
+
+def _max_error(res, ref):
+    return float(max(np.max(np.abs(res[k] - r)) for k, r in zip(('P_single_e', 'P_ee', 'n'), ref) if r is not None))
+
+def run_case(case, repeat=3, references=None):
+    """
+    Benchmark one case: best-of-`repeat` wall time, RHS evaluations (or propagator
+    steps), tracemalloc peak and norm drift on the modulated problem; the max
+    observable error of the same configuration at constant coupling against
+    tavis_spiral.jc_exact ('max_error'); and against a tight DOP853 run of the modulated
+    problem ('modulated_error'), since piecewise propagators are exact at constant g.
+    references (dict) caches those tight runs across solvers.
+    """
+    params = dict(BASE_PARAMS, num_atoms=case['num_atoms'], cav_dim=case['cav_dim'], n_times=case['n_times'],
+                  spiral_mode=case['spiral_mode'], **SOLVERS[case['solver']])
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        res = tavis_spiral.simulate_rabi_spiral(params)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    tavis_spiral.simulate_rabi_spiral(params)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    const = dict(params, omega=0.0)
+    exact = tavis_spiral.jc_exact(const, np.linspace(0, const['T'], const['n_times']))
+    references = {} if references is None else references
+    key = tuple(case[k] for k in MATRIX if k != 'solver')
+    if key not in references:
+        ref = tavis_spiral.simulate_rabi_spiral(dict(params, **REFERENCE))
+        references[key] = (ref['P_single_e'], ref['P_ee'], ref['n'])
+    return dict(case, time_s=min(times), nfev=res['solver'].get('nfev', res['solver'].get('steps')),
+                peak_mb=peak / 2**20, norm_drift=res['solver']['norm_drift'],
+                max_error=_max_error(tavis_spiral.simulate_rabi_spiral(const), exact),
+                modulated_error=_max_error(res, references[key]))
+
+def check_regressions(results, baseline=None, thresholds=THRESHOLDS):
+    """List threshold violations; with a baseline result list, also slowdowns and nfev growth per case."""
+    violations = []
+    for r in results:
+        for metric in ('max_error', 'modulated_error', 'norm_drift'):
+            if r[metric] > thresholds[metric]:
+                violations.append({'case': _case_id(r), 'metric': metric, 'value': r[metric],
+                                   'limit': thresholds[metric]})
+    if baseline:
+        previous = {_case_id(b): b for b in baseline}
+        for r in results:
+            b = previous.get(_case_id(r))
+            if b is None:
+                continue
+            for metric, ratio in (('time_s', 'time_ratio'), ('nfev', 'nfev_ratio')):
+                if b[metric] and r[metric] > thresholds[ratio] * b[metric]:
+                    violations.append({'case': _case_id(r), 'metric': metric, 'value': r[metric],
+                                       'limit': thresholds[ratio] * b[metric]})
+    return violations
+
+def _case_id(case):
+    return '/'.join(f"{k}={case[k]}" for k in MATRIX)
+
+def run_benchmarks(matrix=None, repeat=3, baseline=None, progress=None):
+    """
+    Run every combination of the case matrix.
+    Args:
+        matrix (dict): Axis -> values (default MATRIX); keys as in MATRIX
+        repeat (int): Timing repetitions per case (best is kept)
+        baseline (list): Previous 'results' list to compare against
+        progress (callable): progress(result) after each case
+    Returns:
+        dict: 'results', 'thresholds' and 'violations' (JSON-serializable)
+    """
+    matrix = {**MATRIX, **(matrix or {})}
+    results, references = [], {}
+    for values in itertools.product(*matrix.values()):
+        result = run_case(dict(zip(matrix, values)), repeat, references)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return {'results': results, 'thresholds': THRESHOLDS, 'violations': check_regressions(results, baseline)}
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Tavis-Cummings solver benchmarks")
+    parser.add_argument('--quick', action='store_true', help="Small matrix (1-2 atoms, cav_dim 5, 500 points)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing repetitions per case")
+    parser.add_argument('--baseline', type=str, help="Earlier benchmark JSON to check for regressions")
+    parser.add_argument('--output', type=str, default='tavis_bench.json', help="Output JSON")
+    args = parser.parse_args()
+
+    matrix = {'num_atoms': [1, 2], 'cav_dim': [5], 'n_times': [500]} if args.quick else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    report = run_benchmarks(matrix, args.repeat, baseline, progress=lambda r: print(
+        f"{_case_id(r):75s} {r['time_s'] * 1e3:8.1f} ms  nfev={r['nfev']:<6} "
+        f"peak={r['peak_mb']:.1f} MB  drift={r['norm_drift']:.1e}  err={r['max_error']:.1e}/{r['modulated_error']:.1e}"))
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"{len(report['results'])} cases -> {args.output}, {len(report['violations'])} violations")
+    raise SystemExit(1 if report['violations'] else 0)
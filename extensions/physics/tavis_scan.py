@@ -0,0 +1,176 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.interpolate import LinearNDInterpolator
+
+try:
+    from . import tavis_spiral
+except ImportError:
+    import tavis_spiral  # Same-folder sibling when run as a script
+
+def std_n(res):
+    return res['std_n']
+
+def final_P_single_e(res):
+    return res['P_single_e'][-1]
+
+def final_P_ee(res):
+    return res['P_ee'][-1]
+
+def final_n(res):
+    return res['n'][-1]
+
+METRICS = {'std_n': std_n, 'final_P_single_e': final_P_single_e, 'final_P_ee': final_P_ee, 'final_n': final_n}
+
+def _evaluate_chunk(base_params, names, rows, metric):
+    """
+    Worker: metric for each row of scanned values. When every scanned name is
+    batchable the rows go through one stacked simulate_rabi_batch call.
+    """
+    sets = [dict(base_params, **dict(zip(names, map(float, row)))) for row in rows]
+    if all(name in tavis_spiral.BATCH_VARYING for name in names) and base_params.get('solver', 'RK45') not in (
+            'propagator', 'expm_multiply'):
+        b = tavis_spiral.simulate_rabi_batch(sets, base_params.get('solver', 'RK45'),
+                                             base_params.get('rtol', 1e-8), base_params.get('atol', 1e-9))
+        per_set = [{'std_n': b['std_n'][k], 'P_single_e': b['P_single_e'][k], 'n': b['n'][k],
+                    'P_ee': None if b['P_ee'] is None else b['P_ee'][k], 'tlist': b['tlist']}
+                   for k in range(len(sets))]
+    else:
+        per_set = [tavis_spiral.simulate_rabi_spiral(p) for p in sets]
+    return [float(metric(res)) for res in per_set]
+
+def _cell_score(values, sizes, y_scale):
+    """
+    Refinement priority and split axis of a cell from its 2^d corner values.
+    Per axis, the mean change between opposite faces (gradient proxy) is
+    normalized by the metric's spread and combined with the edge length
+    (fraction of a coarse cell) so big flat cells still get explored; the
+    worst residual of an affine fit (curvature proxy, zero in 1-D) adds to
+    every axis. Returns (score, axis to bisect).
+    """
+    d = len(sizes)
+    corners = np.array(list(itertools.product((0.0, 1.0), repeat=d)))
+    A = np.hstack([corners, np.ones((len(corners), 1))])
+    coef, *_ = np.linalg.lstsq(A, values, rcond=None)
+    curvature = np.max(np.abs(A @ coef - values))
+    change = (np.abs(coef[:d]) + curvature) / y_scale
+    per_axis = np.hypot(change, sizes)
+    axis = int(np.argmax(per_axis))
+    return per_axis[axis], axis
+
+def adaptive_scan(base_params, space, metric='std_n', coarse=5, budget=400, max_depth=6, workers=None,
+                  chunk_size=16, progress=None):
+    """
+    Adaptive scan of simulate_rabi_spiral over a box of parameters.
+    A coarse grid is evaluated first; cells are then ranked by how much the
+    metric changes across their corners (gradient), how far the corners
+    depart from a plane (curvature) and their size, and the worst cells are
+    bisected along their most active axis (2^(d-1) new points per split),
+    one round at a time, until `budget` evaluations are spent.
+    Points live on a dyadic lattice, so neighbouring cells share corners and
+    nothing is simulated twice.
+    Args:
+        base_params (dict): simulate_rabi_spiral params for everything not scanned
+        space (dict): {name: (low, high)} e.g. g_base, D, omega, lambda_decay
+        metric (str | callable): METRICS name or picklable fn(result) -> float
+        coarse (int): Grid points per axis in the first pass
+        budget (int): Total simulations allowed (coarse grid included)
+        max_depth (int): Bisection levels below a coarse cell
+        workers (int | None): Process count (None = all cores, 1 = run in-process)
+        chunk_size (int): Points per task (stacked into one batch solve when possible)
+        progress (callable): progress(evaluated, budget) after each round
+    Returns:
+        dict: 'names', 'points' (n x d), 'values' (n,), 'evaluations', 'rounds' and
+        'interpolator' (callable on (m, d) points, or a 1-D np.interp wrapper)
+    """
+    names = list(space)
+    d = len(names)
+    metric = METRICS.get(metric, metric)
+    low = np.array([space[k][0] for k in names], dtype=float)
+    high = np.array([space[k][1] for k in names], dtype=float)
+    scale = (coarse - 1) * 2**max_depth  # lattice steps per axis
+    evaluated = {}
+
+    def to_values(lattice):
+        return low + (high - low) * np.asarray(lattice, dtype=float) / scale
+
+    def run(lattice_points, pool):
+        lattice_points = [p for p in dict.fromkeys(lattice_points) if p not in evaluated]
+        lattice_points = lattice_points[:max(budget - len(evaluated), 0)]
+        if not lattice_points:
+            return
+        rows = to_values(lattice_points)
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        args = [(base_params, names, chunk, metric) for chunk in chunks]
+        results = pool.map(_evaluate_chunk, *zip(*args)) if pool else itertools.starmap(_evaluate_chunk, args)
+        for p, v in zip(lattice_points, itertools.chain.from_iterable(results)):
+            evaluated[p] = v
+        if progress is not None:
+            progress(len(evaluated), budget)
+
+    def corners(origin, sizes):
+        return [tuple(o + n * c for o, n, c in zip(origin, sizes, offs)) for offs in itertools.product((0, 1), repeat=d)]
+
+    step = 2**max_depth
+    cells = [(tuple(step * i for i in idx), (step,) * d) for idx in itertools.product(range(coarse - 1), repeat=d)]
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    rounds = 0
+    try:
+        run([c for cell in cells for c in corners(*cell)], pool)
+        while len(evaluated) < budget:
+            y_scale = np.ptp(list(evaluated.values())) or 1.0
+            scored = []
+            for origin, sizes in cells:
+                pts = corners(origin, sizes)
+                if all(p in evaluated for p in pts):
+                    score, axis = _cell_score(np.array([evaluated[p] for p in pts]), np.array(sizes) / step, y_scale)
+                    if sizes[axis] > 1:
+                        scored.append((score, axis, origin, sizes))
+            if not scored:
+                break
+            scored.sort(key=lambda item: -item[0])
+            # Refine the top quarter of cells this round, as many as the remaining budget can cover
+            n_split = max(1, min(len(scored) // 4, (budget - len(evaluated)) // 2**(d - 1)))
+            new_cells, new_points, split = [], [], set()
+            for _, axis, origin, sizes in scored[:n_split]:
+                half = list(sizes)
+                half[axis] //= 2
+                shifted = list(origin)
+                shifted[axis] += half[axis]
+                children = [(origin, tuple(half)), (tuple(shifted), tuple(half))]
+                new_cells += children
+                new_points += [p for child in children for p in corners(*child)]
+                split.add((origin, sizes))
+            cells = [c for c in cells if c not in split] + new_cells
+            before = len(evaluated)
+            run(new_points, pool)
+            rounds += 1
+            if len(evaluated) == before:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    lattice = list(evaluated)
+    points = to_values(lattice).reshape(len(lattice), d)
+    values = np.array([evaluated[p] for p in lattice])
+    if d == 1:
+        order = np.argsort(points[:, 0])
+        xs, ys = points[order, 0], values[order]
+        interpolator = lambda x: np.interp(np.asarray(x, dtype=float).reshape(-1), xs, ys)
+    else:
+        interpolator = LinearNDInterpolator(points, values)
+    return {'names': names, 'points': points, 'values': values, 'evaluations': len(values), 'rounds': rounds,
+            'interpolator': interpolator}
+
+# Quick Demo
+if __name__ == "__main__":
+    base_params = {
+        'omega_0': 1.0, 'omega_c': 1.0, 'g_base': 0.2, 'T': 20.0, 'D': 1.5,
+        'omega': 2 * np.pi, 'lambda_decay': 0.1, 'C': 0.5, 'hbar': 1.0,
+        'n_times': 200, 'cav_dim': 5, 'num_atoms': 2
+    }
+    scan = adaptive_scan(base_params, {'g_base': (0.1, 0.5), 'D': (1.0, 2.0)}, metric='std_n', budget=200,
+                         progress=lambda done, total: print(f"  {done}/{total} sims"))
+    print(f"{scan['evaluations']} sims in {scan['rounds']} refinement rounds")
+    print("std_n at (g=0.3, D=1.5):", scan['interpolator']([[0.3, 1.5]])[0])
@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
+import math
 import numpy as np
+import scipy.sparse as sp
 from scipy.integrate import solve_ivp
+from scipy.sparse.linalg import expm_multiply
 import matplotlib.pyplot as plt  # For optional viz
 
 def define_R(t, params):
-    """R(t) modulator: ℏ [(t/T)^D(t) sin(ω t) e^{-λ t} + C] with spiral surprise option."""
+    """
+    R(t) modulator: ℏ [(t/T)^D(t) sin(ω t) e^{-λ t} + C] with spiral surprise option.
+    Array-native: t may be a scalar or any-shape array (spiral_mode's nested FRDM
+    term included); scalars return np.float64, arrays an array of the same shape.
+    Params may also be arrays that broadcast against t (stacked batch runs).
+    """
+    args = _scalar_R_args(params)
+    if args is not None and isinstance(t, (int, float)):
+        return np.float64(_scalar_R(t, *args))
+    t = np.asarray(t, dtype=float)
     hbar, T, omega, lambda_decay, C = [params[k] for k in ['hbar', 'T', 'omega', 'lambda_decay', 'C']]
     base_D = params['D']
     
-    if params.get('spiral_mode', False):
+    spiral = params.get('spiral_mode', False)
+    if np.any(spiral):
         # Spiral surprise: Dynamic D via nested FRDM
         inner_T = T / 2
         inner_omega = omega * 1.5
@@ -16,11 +29,24 @@ def define_R(t, params):
         inner_C = 0.2
         inner_hbar = 1.0  # Normalized
         delta_D = inner_hbar * ((t / inner_T)**0.5 * np.sin(inner_omega * t) * np.exp(-inner_lambda * t) + inner_C)
-        D = base_D + np.clip(delta_D, -0.5, 0.5)
+        D = base_D + np.where(spiral, np.clip(delta_D, -0.5, 0.5), 0.0)  # spiral_mode may be per-set (batch)
     else:
         D = base_D
     
-    return hbar * ((t / T)**D * np.sin(omega * t) * np.exp(-lambda_decay * t) + C)
+    R = hbar * ((t / T)**D * np.sin(omega * t) * np.exp(-lambda_decay * t) + C)
+    return R[()]  # 0-d -> np.float64
+
+def _scalar_R_args(params):
+    """(hbar, T, omega, lambda_decay, C, D, spiral_mode) when all are plain scalars, else None (batch arrays)."""
+    args = tuple(params[k] for k in ('hbar', 'T', 'omega', 'lambda_decay', 'C', 'D')) + (params.get('spiral_mode', False),)
+    return args if all(isinstance(a, (int, float)) for a in args) else None
+
+def _scalar_R(t, hbar, T, omega, lambda_decay, C, D, spiral):
+    """define_R for scalar t and params in plain math: no array coercion on the RHS hot path."""
+    if spiral:
+        delta_D = (t / (T / 2))**0.5 * math.sin(omega * 1.5 * t) * math.exp(-lambda_decay * 0.5 * t) + 0.2
+        D = D + min(max(delta_D, -0.5), 0.5)
+    return hbar * ((t / T)**D * math.sin(omega * t) * math.exp(-lambda_decay * t) + C)
 
 def spiral_mark(params):
     """Spiral logic watermark: Unique quotient for tracking, EU AI Act compliant."""
@@ -28,52 +54,200 @@ def spiral_mark(params):
     sq = ((D * omega / (1 + lambda_decay)) % 1) * 100
     return f"SpiralMark-{int(sq):03d}-EUCompliant"
 
-def build_hamiltonian_matrix(t, omega_0, omega_c, g_base, R_params, cav_dim=5, num_atoms=2):
-    """Time-dependent Tavis-Cummings Hamiltonian for num_atoms (up to 2) in cavity."""
-    N = cav_dim
-    if num_atoms == 1:
-        atom_states = 2  # g, e
-        atomic_energies = np.array([-omega_0 / 2, omega_0 / 2])
+def tavis_basis(num_atoms=2, basis=None):
+    """
+    Atomic block of the basis |s, n> (flat index = atom_states * n + s).
+    basis='product' spells out 1 or 2 atoms (g/e, gg/ge/eg/ee); basis='dicke'
+    uses the symmetric manifold |J=N/2, k excited> with k = 0..N, valid for N
+    identically coupled atoms. Default: product up to 2 atoms, Dicke beyond.
+    Returns dict: kind, atom_states, atomic_energies (in units of omega_0), the
+    collective lowering operator sum_i sigma_-^i as an (atom_states x atom_states)
+    matrix, excitations (excited atoms per state) and init_state (all excited).
+    """
+    kind = basis or ('product' if num_atoms <= 2 else 'dicke')
+    if kind == 'dicke':
+        k = np.arange(num_atoms + 1)
+        energies = k - num_atoms / 2
+        # J- |k> = sqrt(k (N - k + 1)) |k - 1>
+        lowering = np.diag(np.sqrt(k[1:] * (num_atoms - k[1:] + 1.0)), 1)
+        excitations = k
+    elif kind != 'product' or num_atoms > 2:
+        raise ValueError(f"Unsupported basis {kind!r} for {num_atoms} atoms (product basis covers 1-2 atoms)")
+    elif num_atoms == 1:
+        energies = np.array([-0.5, 0.5])  # g, e
+        lowering = np.array([[0.0, 1.0],
+                             [0.0, 0.0]])  # e -> g
+        excitations = np.array([0, 1])
     else:  # 2 atoms: gg=0, ge=1, eg=2, ee=3
-        atom_states = 4
-        atomic_energies = np.array([-omega_0, 0, 0, omega_0])  # Symmetric ge/eg at 0
-    
-    dim = atom_states * N
-    H = np.zeros((dim, dim), dtype=complex)
-    
-    # Free terms
-    for n in range(N):
-        offset = atom_states * n
-        for s in range(atom_states):
-            H[offset + s, offset + s] = atomic_energies[s] + omega_c * n
-    
-    # Interaction: g(t) sum_i (sigma_-^i a† + h.c.)
+        energies = np.array([-1.0, 0.0, 0.0, 1.0])  # Symmetric ge/eg at 0
+        lowering = np.zeros((4, 4))
+        lowering[0, 1] = lowering[1, 3] = 1.0  # sigma_-1: ge -> gg, ee -> ge
+        lowering[0, 2] = lowering[2, 3] = 1.0  # sigma_-2: eg -> gg, ee -> eg
+        excitations = np.array([0, 1, 1, 2])
+    return {'kind': kind, 'atom_states': len(energies), 'atomic_energies': energies, 'lowering': lowering,
+            'excitations': excitations, 'init_state': len(energies) - 1}
+
+def build_static_operators(omega_0, omega_c, cav_dim=5, num_atoms=2, basis=None, states=None, sparse=False):
+    """
+    Time-independent pieces of the Tavis-Cummings Hamiltonian, H(t) = diag(h0) + g(t) V.
+    V = a† L + h.c. with L the collective lowering operator; entries are
+    generated per state pair, so passing `states` builds just that block
+    without ever forming the full (atom_states * cav_dim)^2 matrix.
+    With sparse=True, V is a scipy.sparse CSR matrix and memory is O(nnz).
+    Returns:
+        tuple: (h0 diagonal of shape (dim,), real symmetric coupling pattern V (dim x dim))
+    """
+    b = tavis_basis(num_atoms, basis)
+    atom_states = b['atom_states']
+    states = np.arange(atom_states * cav_dim) if states is None else np.asarray(states)
+    n, s = np.divmod(states, atom_states)
+    h0 = omega_0 * b['atomic_energies'][s] + omega_c * n
+    if sparse:
+        a_dag = sp.diags(np.sqrt(np.arange(1, cav_dim)), -1, format='csr')
+        V = sp.kron(a_dag, sp.csr_matrix(b['lowering']), format='csr')
+        V = (V + V.T).tocsr()
+        if len(states) != V.shape[0]:
+            V = V[states][:, states]
+        return h0, V
+    # kron(a†, L)[i, j] = a†[n_i, n_j] L[s_i, s_j], with a†[n+1, n] = sqrt(n+1)
+    V = np.where(n[:, None] == n[None, :] + 1, np.sqrt(n)[:, None], 0.0) * b['lowering'][np.ix_(s, s)]
+    return h0, V + V.T
+
+def build_hamiltonian_matrix(t, omega_0, omega_c, g_base, R_params, cav_dim=5, num_atoms=2, basis=None):
+    """Time-dependent Tavis-Cummings Hamiltonian for num_atoms in cavity (product basis up to 2, Dicke beyond)."""
+    h0, V = build_static_operators(omega_0, omega_c, cav_dim, num_atoms, basis)
     g_t = g_base * define_R(t, R_params)
-    
-    for n in range(N - 1):
-        offset_n = atom_states * n
-        offset_np1 = atom_states * (n + 1)
-        sqrt_np1 = np.sqrt(n + 1)
-        
-        if num_atoms == 1:
-            # Single atom JC
-            H[offset_np1 + 0, offset_n + 1] = g_t * sqrt_np1  # g n+1 <- e n (sigma_- a†)
-            H[offset_n + 1, offset_np1 + 0] = np.conj(g_t * sqrt_np1)  # h.c.
+    return (np.diag(h0) + g_t * V).astype(complex)
+
+def excitation_subspace(num_atoms, cav_dim, init_idx, basis=None):
+    """
+    Basis indices of the conserved manifold reached from basis state init_idx.
+    Under the RWA, V only couples states with equal excitation number
+    N_exc = excited atoms + photons, so the dynamics stay inside one block.
+    Falls back to the full basis if the lowering operator does not remove
+    exactly one excitation.
+    """
+    b = tavis_basis(num_atoms, basis)
+    atom_states, excitations = b['atom_states'], b['excitations']
+    rows, cols = np.nonzero(b['lowering'])
+    if np.any(excitations[rows] != excitations[cols] - 1):
+        return np.arange(atom_states * cav_dim)
+    target = excitations[init_idx % atom_states] + init_idx // atom_states
+    n = target - excitations  # photon number paired with each atom state
+    valid = (n >= 0) & (n < cav_dim)
+    return np.sort(atom_states * n[valid] + np.flatnonzero(valid))
+
+class RabiRHS:
+    """
+    Real-block ODE right-hand side for psi = x + i p under H(t) = diag(h0) + g(t) V:
+    dx/dt = H p, dp/dt = -H x. The static operators are built once; each call
+    only evaluates the scalar g(t) = g_base * R(t) and two matvecs into scratch
+    buffers. The result vector is fresh per call because solve_ivp keeps it.
+    V may be dense or scipy.sparse.
+    """
+
+    def __init__(self, h0, V, g_base, R_params):
+        self.h0 = h0
+        self.V = V
+        self._sparse = sp.issparse(V)
+        self.g_base = g_base
+        self.R_params = R_params
+        self._R_args = _scalar_R_args(R_params)  # Pulled out once; None falls back to define_R
+        self.dim = len(h0)
+        self._buf = np.empty(self.dim)
+        self.nfev = 0
+
+    def __call__(self, t, y):
+        self.nfev += 1
+        dim, buf = self.dim, self._buf
+        x, p = y[:dim], y[dim:]
+        R = _scalar_R(t, *self._R_args) if self._R_args is not None else define_R(t, self.R_params)
+        g_t = self.g_base * R
+        out = np.empty(2 * dim)
+        dx, dp = out[:dim], out[dim:]
+        if self._sparse:
+            np.multiply(self.V @ p, g_t, out=dx)
+        else:
+            np.dot(self.V, p, out=dx)
+            dx *= g_t
+        np.multiply(self.h0, p, out=buf)
+        dx += buf
+        if self._sparse:
+            np.multiply(self.V @ x, -g_t, out=dp)
         else:
-            # Two atoms Tavis-Cummings (identical g)
-            # sigma_-1 a†: ge n -> gg n+1, ee n -> ge n+1
-            H[offset_np1 + 0, offset_n + 1] = g_t * sqrt_np1  # gg np1 <- ge n
-            H[offset_np1 + 1, offset_n + 3] = g_t * sqrt_np1  # ge np1 <- ee n
-            # sigma_-2 a†: eg n -> gg n+1, ee n -> eg n+1
-            H[offset_np1 + 0, offset_n + 2] = g_t * sqrt_np1  # gg np1 <- eg n
-            H[offset_np1 + 2, offset_n + 3] = g_t * sqrt_np1  # eg np1 <- ee n
-            # h.c.
-            H[offset_n + 1, offset_np1 + 0] = np.conj(g_t * sqrt_np1)
-            H[offset_n + 3, offset_np1 + 1] = np.conj(g_t * sqrt_np1)
-            H[offset_n + 2, offset_np1 + 0] = np.conj(g_t * sqrt_np1)
-            H[offset_n + 3, offset_np1 + 2] = np.conj(g_t * sqrt_np1)
+            np.dot(self.V, x, out=dp)
+            dp *= -g_t
+        np.multiply(self.h0, x, out=buf)
+        dp -= buf
+        return out
+
+GAUSS_NODES_4 = (0.5 - np.sqrt(3) / 6, 0.5 + np.sqrt(3) / 6)
+
+def propagate_magnus(h0, V, g_base, R_params, tlist, psi0, order=2, substeps=1, krylov=False):
+    """
+    Piecewise propagation psi(t + h) = exp(Omega) psi(t) between tlist points,
+    `substeps` steps per interval. order=2 is the midpoint rule
+    Omega = -i h H(t + h/2); order=4 is the Gauss-point Magnus expansion
+    Omega = -i h/2 (H1 + H2) - (sqrt(3) h^2 / 12) (g1 - g2) [H0, V].
+    All g(t) samples come from one vectorized define_R call. Dense steps
+    exponentiate via eigh, so every step is unitary and the norm is preserved
+    to round-off; krylov=True uses scipy.sparse.linalg.expm_multiply instead.
+    Returns:
+        tuple: (complex states of shape (len(tlist), dim), number of steps)
+    """
+    tlist = np.asarray(tlist, dtype=float)
+    h = np.diff(tlist) / substeps
+    starts = tlist[:-1, None] + h[:, None] * np.arange(substeps)
+    if order == 2:
+        g_mid = g_base * define_R(starts + 0.5 * h[:, None], R_params)
+    elif order == 4:
+        g1 = g_base * define_R(starts + GAUSS_NODES_4[0] * h[:, None], R_params)
+        g2 = g_base * define_R(starts + GAUSS_NODES_4[1] * h[:, None], R_params)
+    else:
+        raise ValueError(f"Magnus order must be 2 or 4, got {order}")
+    if krylov:
+        H0 = sp.diags(h0, format='csr')
+        V = sp.csr_matrix(V)
+        C = H0 @ V - V @ H0 if order == 4 else None
+    else:
+        H0 = np.diag(h0)
+        V = V.toarray() if sp.issparse(V) else V
+        C = (h0[:, None] - h0[None, :]) * V if order == 4 else None  # [H0, V]
     
-    return H
+    states = np.empty((len(tlist), len(h0)), dtype=complex)
+    psi = np.asarray(psi0, dtype=complex)
+    states[0] = psi
+    for i in range(len(tlist) - 1):
+        for j in range(substeps):
+            # Omega = -i K with K Hermitian
+            if order == 2:
+                K = h[i] * (H0 + g_mid[i, j] * V)
+            else:
+                K = (h[i] / 2) * (2 * H0 + (g1[i, j] + g2[i, j]) * V) \
+                    - 1j * (np.sqrt(3) * h[i]**2 / 12) * (g1[i, j] - g2[i, j]) * C
+            if krylov:
+                psi = expm_multiply(-1j * K, psi)
+            else:
+                w, Q = np.linalg.eigh(K)
+                psi = Q @ (np.exp(-1j * w) * (Q.conj().T @ psi))
+        states[i + 1] = psi
+    return states, (len(tlist) - 1) * substeps
+
+def _integrate(solver, h0, V, params, tlist, psi0):
+    """Dispatch to solve_ivp (any of its methods) or the piecewise propagators. Returns (states, info)."""
+    if solver in ('propagator', 'expm_multiply'):
+        krylov = solver == 'expm_multiply' or sp.issparse(V)
+        states, steps = propagate_magnus(h0, V, params['g_base'], params, tlist, psi0,
+                                         params.get('magnus_order', 2), params.get('substeps', 1), krylov)
+        return states, {'name': solver, 'steps': steps, 'magnus_order': params.get('magnus_order', 2)}
+    dim = len(h0)
+    rhs = RabiRHS(h0, V, params['g_base'], params)
+    psi0 = np.asarray(psi0)
+    if tlist[-1] == tlist[0]:  # Single output point (n_times=1): nothing to integrate
+        return np.tile(psi0.astype(complex), (len(tlist), 1)), {'name': solver, 'nfev': 0}
+    sol = solve_ivp(rhs, [tlist[0], tlist[-1]], np.concatenate((psi0.real, psi0.imag)), t_eval=tlist,
+                    method=solver, rtol=params.get('rtol', 1e-8), atol=params.get('atol', 1e-9))  # Sharper tolerances for SOTA edge
+    return (sol.y[:dim] + 1j * sol.y[dim:]).T, {'name': solver, 'nfev': sol.nfev}
 
 def rabi_deriv_real(t, y, args):
     """Derivative: Complex psi as real/imag vector."""
@@ -86,59 +260,91 @@ def rabi_deriv_real(t, y, args):
     dy_imag = np.imag(dpsi_dt)
     return np.concatenate((dy_real, dy_imag))
 
+def _observables(states, photons, excited, num_atoms, extra=None):
+    """
+    P_single_e, P_ee (None for one atom) and <n> for every time point at once.
+    Rows are renormalized, then reduced against per-state photon/excitation labels.
+    Args:
+        states (np.ndarray): Complex block states, shape (n_times, sub_dim)
+        photons, excited (np.ndarray): Photon number and excited-atom count per retained state
+        num_atoms (int): Atom count (P_ee = all atoms excited)
+        extra (dict): Optional {name: fn(psi, photons, excited)} user observables; psi is the
+            normalized (n_times, sub_dim) state array and fn returns one value per time
+    Returns:
+        tuple: (P_single_e, P_ee, <n>), plus a dict of user observables when extra is given
+    """
+    norms = np.linalg.norm(states, axis=1, keepdims=True)
+    psi = states / np.where(norms > 0, norms, 1.0)
+    prob = np.abs(psi)**2
+    
+    # One-hot marginals: single excitation (ge/eg, e, or Dicke k=1) and all excited (ee, or Dicke k=N)
+    masks = np.stack([excited == 1, excited == num_atoms], axis=1).astype(float)
+    P_single_e, P_ee = (prob @ masks).T
+    expect_n = prob @ photons
+    if num_atoms < 2:
+        P_ee = None
+    if extra is None:
+        return P_single_e, P_ee, expect_n
+    return P_single_e, P_ee, expect_n, {name: np.asarray(fn(psi, photons, excited)) for name, fn in extra.items()}
+
+def photon_number_variance(psi, photons, excited):
+    """Example observable: Var(n) = <n^2> - <n>^2 per time point."""
+    prob = np.abs(psi)**2
+    mean = prob @ photons
+    return prob @ photons**2 - mean**2
+
+def _block_setup(params):
+    """Basis, retained block indices, initial state and per-state labels shared by the simulators."""
+    num_atoms = params.get('num_atoms', 1)
+    basis = tavis_basis(num_atoms, params.get('basis'))
+    cav_dim = params.get('cav_dim', 3)  # Baseline default; no longer capped at 5
+    atom_states = basis['atom_states']
+    dim = atom_states * cav_dim
+    # Initial: all atoms excited, empty cavity (|e 0>, |ee 0>, |k=N 0>)
+    init_idx = basis['init_state']
+    
+    # Integrate only the excitation-number block reachable from the initial state
+    if params.get('excitation_blocks', True):
+        idx = excitation_subspace(num_atoms, cav_dim, init_idx, basis['kind'])
+    else:
+        idx = np.arange(dim)
+    sub_dim = len(idx)
+    psi0 = np.zeros(sub_dim)
+    psi0[np.searchsorted(idx, init_idx)] = 1.0
+    # Photon number and atomic excitation per retained state, for the expectations
+    photons, atom_idx = np.divmod(idx, atom_states)
+    # Sparse CSR operators once the block outgrows dense matvecs (memory O(nnz), not O(dim^2))
+    backend = params.get('backend', 'sparse' if sub_dim > 256 else 'dense')
+    return {'num_atoms': num_atoms, 'cav_dim': cav_dim, 'basis': basis, 'idx': idx, 'psi0': psi0, 'photons': photons,
+            'excited': basis['excitations'][atom_idx], 'sparse': backend == 'sparse'}
+
 def simulate_rabi_spiral(params):
     """Core sim: Tavis-Cummings with spiral options. Returns populations, <n>, etc."""
     mark = spiral_mark(params)
-    num_atoms = params.get('num_atoms', 1)
-    if num_atoms > 1:
-        params['cav_dim'] = min(params.get('cav_dim', 3), 5)  # Tame dim for multi
     tlist = np.linspace(0, params['T'], params['n_times'])
+    block = _block_setup(params)
+    num_atoms, photons, excited, psi0 = block['num_atoms'], block['photons'], block['excited'], block['psi0']
+    h0, V = build_static_operators(params['omega_0'], params['omega_c'], block['cav_dim'], num_atoms,
+                                   block['basis']['kind'], block['idx'], sparse=block['sparse'])
     
-    cav_dim = params['cav_dim']
-    atom_states = 2 if num_atoms == 1 else 4
-    dim = atom_states * cav_dim
-    y0 = np.zeros(2 * dim)
-    # Initial: |e 0> for 1 atom (idx 1), |ee 0> for 2 (idx 3)
-    init_idx = 1 if num_atoms == 1 else 3
-    y0[init_idx] = 1.0
+    solver = params.get('solver', 'RK45')
+    states, solver_info = _integrate(solver, h0, V, params, tlist, psi0)
+    solver_info['norm_drift'] = float(np.max(np.abs(np.linalg.norm(states, axis=1) - 1)))
     
-    args = (params['omega_0'], params['omega_c'], params['g_base'], params, cav_dim, num_atoms)
-    
-    sol = solve_ivp(rabi_deriv_real, [0, params['T']], y0, t_eval=tlist, args=(args,),
-                    method='RK45', rtol=1e-8, atol=1e-9)  # Sharper tolerances for SOTA edge
-    
-    # Expectations
-    P_ee = np.zeros(len(tlist)) if num_atoms == 2 else None
-    P_single_e = np.zeros(len(tlist))
-    expect_n = np.zeros(len(tlist))
-    
-    for i, y in enumerate(sol.y.T):
-        psi = y[:dim] + 1j * y[dim:]
-        norm = np.linalg.norm(psi)
-        if norm > 0:
-            psi /= norm
-        
-        if num_atoms == 2:
-            # P_ee: sum |ee n|^2
-            P_ee[i] = np.sum(np.abs(psi[3::4])**2)
-            # P_single_e: sum (|ge n|^2 + |eg n|^2)
-            P_single_e[i] = np.sum(np.abs(psi[1::4])**2 + np.abs(psi[2::4])**2)
-        else:
-            # Single atom P_e
-            P_single_e[i] = np.sum(np.abs(psi[1::2])**2)
-        
-        # <n>
-        n_tot = 0.0
-        for n in range(cav_dim):
-            if num_atoms == 2:
-                amp_n = np.sum(np.abs(psi[4*n:4*n+4])**2)
-            else:
-                amp_n = np.sum(np.abs(psi[2*n:2*n+2])**2)
-            n_tot += n * amp_n
-        expect_n[i] = n_tot
+    P_single_e, P_ee, expect_n, observables = _observables(states, photons, excited, num_atoms,
+                                                           params.get('observables', {}))
+    if params.get('validate') and solver != 'RK45':
+        # Cross-check against the adaptive RK45 reference on the same grid
+        ref_states, _ = _integrate('RK45', h0, V, params, tlist, psi0)
+        ref = _observables(ref_states, photons, excited, num_atoms)
+        solver_info['error_vs_rk45'] = {
+            name: float(np.max(np.abs(a - b)))
+            for name, a, b in zip(('P_single_e', 'P_ee', 'n'), (P_single_e, P_ee, expect_n), ref) if a is not None
+        }
     
     std_n = np.std(expect_n)
-    R_samples = [define_R(tt, params) for tt in [0, 5, 10, 15, 20]]
+    R_t = define_R(tlist, params)  # Cached series for plots/exports
+    R_samples = list(define_R(np.array([0, 5, 10, 15, 20]), params))
     
     return {
         'tlist': tlist,
@@ -146,20 +352,144 @@ def simulate_rabi_spiral(params):
         'P_single_e': P_single_e,
         'n': expect_n,
         'std_n': std_n,
+        'R_t': R_t,
         'R_samples': R_samples,
-        'spiral_mark': mark
+        'spiral_mark': mark,
+        'solver': solver_info,
+        'observables': observables
     }
 
+BATCH_VARYING = ('omega_0', 'omega_c', 'g_base', 'D', 'omega', 'lambda_decay', 'C', 'hbar', 'spiral_mode')
+
+class BatchRabiRHS:
+    """
+    Stacked RabiRHS for K parameter sets sharing one coupling pattern V:
+    y = [x (K, dim), p (K, dim)] flattened. Both halves of every set go
+    through V in a single matrix product, and g(t) for all sets comes from
+    one define_R call over (K, 1) parameter columns.
+    """
+
+    def __init__(self, h0, V, g_base, R_params):
+        self.h0 = h0  # (K, dim)
+        self.V = V
+        self._sparse = sp.issparse(V)
+        self.g_base = g_base  # (K, 1)
+        self.R_params = R_params
+        self.K, self.dim = h0.shape
+        self.nfev = 0
+
+    def __call__(self, t, y):
+        self.nfev += 1
+        Y = y.reshape(2 * self.K, self.dim)
+        VY = (self.V @ Y.T).T if self._sparse else Y @ self.V  # V is symmetric
+        g_t = self.g_base * define_R(t, self.R_params)
+        x, p = Y[:self.K], Y[self.K:]
+        out = np.empty_like(y)
+        dx, dp = out.reshape(2, self.K, self.dim)
+        np.multiply(g_t, VY[self.K:], out=dx)
+        dx += self.h0 * p
+        np.multiply(-g_t, VY[:self.K], out=dp)
+        dp -= self.h0 * x
+        return out
+
+def stack_params(param_sets):
+    """
+    Merge K param dicts into one dict: BATCH_VARYING keys become (K, 1) columns,
+    everything else (T, n_times, cav_dim, num_atoms, basis, ...) must agree.
+    """
+    stacked = {}
+    for key in set().union(*param_sets):
+        values = [p.get(key, False if key == 'spiral_mode' else None) for p in param_sets]
+        if key in BATCH_VARYING:
+            stacked[key] = np.asarray(values, dtype=bool if key == 'spiral_mode' else float)[:, None]
+        elif any(v != values[0] for v in values[1:]):
+            raise ValueError(f"Batched parameter sets must share {key!r}; got {values}")
+        else:
+            stacked[key] = values[0]
+    return stacked
+
+def simulate_rabi_batch(param_sets, solver='RK45', rtol=1e-8, atol=1e-9, observables=None):
+    """
+    Integrate K Tavis-Cummings parameter sets as one stacked ODE in a single solve_ivp call.
+    Sets may differ in BATCH_VARYING values (frequencies, g_base, the R(t) shape
+    and spiral_mode) but share T, n_times, cav_dim, num_atoms and basis, hence
+    tlist and the coupling pattern V. The solver takes one common adaptive step
+    sequence, so per-call overhead is paid once for the whole scan.
+    Args:
+        param_sets (list[dict]): simulate_rabi_spiral params, one per set
+        solver (str): Any solve_ivp method
+        rtol, atol (float): Tolerances on the stacked state
+        observables (dict): {name: fn(psi, photons, excited)} as in simulate_rabi_spiral
+    Returns:
+        dict: 'tlist', 'P_single_e', 'P_ee' (None for one atom), 'n' and 'R_t' as (K, n_times)
+        arrays, 'std_n' (K,), 'spiral_marks', 'solver' info and 'observables'
+    """
+    params = stack_params(param_sets)
+    K = len(param_sets)
+    tlist = np.linspace(0, params['T'], params['n_times'])
+    block = _block_setup(params)
+    num_atoms, psi0 = block['num_atoms'], block['psi0']
+    h0, V = build_static_operators(params['omega_0'], params['omega_c'], block['cav_dim'], num_atoms,
+                                   block['basis']['kind'], block['idx'], sparse=block['sparse'])
+    dim = len(psi0)
+    
+    rhs = BatchRabiRHS(h0, V, params['g_base'], params)
+    y0 = np.concatenate((np.tile(psi0, K), np.zeros(K * dim)))
+    sol = solve_ivp(rhs, [0, params['T']], y0, t_eval=tlist, method=solver, rtol=rtol, atol=atol)
+    y = sol.y.reshape(2, K, dim, len(tlist))
+    states = (y[0] + 1j * y[1]).transpose(0, 2, 1)  # (K, n_times, dim)
+    
+    flat = states.reshape(-1, dim)
+    P_single_e, P_ee, expect_n, extra = _observables(flat, block['photons'], block['excited'], num_atoms,
+                                                     observables or {})
+    shape = (K, len(tlist))
+    expect_n = expect_n.reshape(shape)
+    return {
+        'tlist': tlist,
+        'P_ee': P_ee.reshape(shape) if P_ee is not None else None,
+        'P_single_e': P_single_e.reshape(shape),
+        'n': expect_n,
+        'std_n': np.std(expect_n, axis=1),
+        'R_t': define_R(tlist, params),
+        'spiral_marks': [spiral_mark(p) for p in param_sets],
+        'solver': {'name': solver, 'nfev': sol.nfev,
+                   'norm_drift': np.max(np.abs(np.linalg.norm(states, axis=2) - 1), axis=1)},
+        'observables': {name: v.reshape(shape + v.shape[1:]) for name, v in extra.items()}
+    }
+
+def jc_exact(params, tlist):
+    """
+    Reference dynamics for constant coupling g = g_base * hbar * C (what define_R
+    reduces to with omega = 0). One atom uses the closed-form Jaynes-Cummings
+    result P_e = 1 - (4g^2 / W^2) sin^2(W t / 2), W = sqrt(Delta^2 + 4g^2), <n> = 1 - P_e;
+    more atoms use an exact eigendecomposition of the static block Hamiltonian.
+    Returns:
+        tuple: (P_single_e, P_ee or None, <n>)
+    """
+    g = params['g_base'] * params['hbar'] * params['C']
+    num_atoms = params.get('num_atoms', 1)
+    block = _block_setup(params)
+    if num_atoms == 1 and block['cav_dim'] >= 2:
+        delta = params['omega_0'] - params['omega_c']
+        W = np.sqrt(delta**2 + 4 * g**2)
+        P_e = 1 - (4 * g**2 / W**2) * np.sin(W * tlist / 2)**2
+        return P_e, None, 1 - P_e
+    h0, V = build_static_operators(params['omega_0'], params['omega_c'], block['cav_dim'], num_atoms,
+                                   block['basis']['kind'], block['idx'])
+    w, Q = np.linalg.eigh(np.diag(h0) + g * V)
+    states = (Q @ (np.exp(-1j * np.outer(w, tlist)) * (Q.T @ block['psi0'])[:, None])).T
+    return _observables(states, block['photons'], block['excited'], num_atoms)
+
 def visualize_results(res, params, title='Spiral Tavis-Cummings Extension'):
     """Plot populations and <n>."""
     num_atoms = params.get('num_atoms', 1)
-    fig, ax = plt.subplots(3 if num_atoms == 2 else 2, 1, figsize=(10, 8))
+    fig, ax = plt.subplots(3 if num_atoms >= 2 else 2, 1, figsize=(10, 8))
     ax[0].plot(res['tlist'], res['P_single_e'], label='P_single_e(t)', color='blue')
     ax[0].set_ylabel('Single Excitation Prob')
     ax[0].legend(); ax[0].grid(alpha=0.3)
-    if num_atoms == 2:
+    if num_atoms >= 2:
         ax[1].plot(res['tlist'], res['P_ee'], label='P_ee(t)', color='green')
-        ax[1].set_ylabel('Double Excitation Prob')
+        ax[1].set_ylabel('Double Excitation Prob' if num_atoms == 2 else 'Full Excitation Prob')
         ax[1].legend(); ax[1].grid(alpha=0.3)
         ax[2].plot(res['tlist'], res['n'], label='<n>(t)', color='red')
         ax[2].set_ylabel('Photon Number'); ax[2].set_xlabel('Time t')
@@ -170,7 +500,7 @@ def visualize_results(res, params, title='Spiral Tavis-Cummings Extension'):
         ax[1].legend(); ax[1].grid(alpha=0.3)
     plt.suptitle(f"{title} (std_n = {res['std_n']:.3f}, Mark: {res['spiral_mark']}, Mode: {'Spiral' if params.get('spiral_mode') else 'Base'})")
     plt.tight_layout()
-    viz_file = 'tavis_spiral_viz.png' if num_atoms == 2 else 'rabi_spiral_viz.png'
+    viz_file = 'tavis_spiral_viz.png' if num_atoms >= 2 else 'rabi_spiral_viz.png'
     plt.savefig(viz_file, dpi=150)
     plt.show()
     print(f"Viz saved: {viz_file}")
@@ -0,0 +1,273 @@
+import os
+import json
+import struct
+import hashlib
+from collections import deque
+from datetime import datetime, timezone
+import numpy as np
+
+from spiral_provenance import PARAM_FIELDS
+
+MAGIC = b'SPRVSTOR'
+SCHEMA_VERSION = 1
+HEADER = struct.Struct('<8sHHI16s32s')  # magic, version, flags, record size, schema name, genesis hash
+HEADER_SIZE = HEADER.size  # 64 bytes
+CHAIN_SIZE = 32  # sha256 digest stored as the last field of every record
+
+THEME_CLASSES = ('work', 'play', 'mixed', 'blocked')
+
+SCHEMAS = {
+    # SpiralEngine per-cycle provenance rows
+    'path': np.dtype(
+        [('cycle', '<i8')] + [(name, '<f8') for name in PARAM_FIELDS]
+        + [('sign', 'i1'), ('base', '<f8'), ('adjustment', '<f8'), ('value', '<f8'),
+           ('chain', 'u1', CHAIN_SIZE)]),
+    # Auditors/theme_sentry classification events
+    'theme': np.dtype([
+        ('timestamp_us', '<i8'), ('input_hash', 'S12'), ('classification', 'u1'),
+        ('reason', 'S64'), ('redirect', 'S64'), ('user_bypass', '?'),
+        ('chain', 'u1', CHAIN_SIZE)]),
+}
+
+def _genesis(schema):
+    return hashlib.sha256(MAGIC + struct.pack('<HI', SCHEMA_VERSION, SCHEMAS[schema].itemsize) + schema.encode()).digest()
+
+def read_header(path):
+    """Parse and validate a store header. Returns dict(schema, version, record_size, genesis)."""
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path}: truncated provenance header")
+    magic, version, _flags, record_size, schema, genesis = HEADER.unpack(raw)
+    schema = schema.rstrip(b'\0').decode()
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a provenance store")
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported schema version {version}")
+    if schema not in SCHEMAS or SCHEMAS[schema].itemsize != record_size:
+        raise ValueError(f"{path}: unknown schema {schema!r} (record size {record_size})")
+    return {'schema': schema, 'version': version, 'record_size': record_size, 'genesis': genesis}
+
+def _text_field(schema, name, value):
+    """UTF-8 bytes for a fixed-width string field; over-long values are rejected, never cut."""
+    raw = value.encode()
+    size = SCHEMAS[schema].fields[name][0].itemsize
+    if len(raw) > size:
+        raise ValueError(f"{name!r} is {len(raw)} bytes encoded; the {schema!r} schema holds at most {size}")
+    return raw
+
+def _encode(schema, entry):
+    """Dict (JSONL / get_provenance() shape) -> record tuple without the chain field."""
+    if schema == 'path':
+        params = entry['params']
+        return ((entry['cycle'],) + tuple(params[k] for k in PARAM_FIELDS)
+                + (1 if entry['sign'] == '+' else -1, entry['base'], entry['adjustment'], entry['value']))
+    ts = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    delta = ts - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return ((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds,
+            _text_field(schema, 'input_hash', entry['input_hash']), THEME_CLASSES.index(entry['classification']),
+            _text_field(schema, 'reason', entry['reason']), _text_field(schema, 'redirect', entry['redirect']),
+            bool(entry['user_bypass']))
+
+def _decode(schema, rec):
+    """Record -> dict in the original JSONL / get_provenance() shape."""
+    if schema == 'path':
+        return {
+            'cycle': int(rec['cycle']),
+            'params': {k: float(rec[k]) for k in PARAM_FIELDS},
+            'sign': '+' if rec['sign'] > 0 else '-',
+            'base': float(rec['base']),
+            'adjustment': float(rec['adjustment']),
+            'value': float(rec['value'])
+        }
+    us = int(rec['timestamp_us'])
+    ts = datetime.fromtimestamp(us // 1_000_000, tz=timezone.utc).replace(microsecond=us % 1_000_000, tzinfo=None)
+    return {
+        'timestamp': ts.isoformat() + 'Z',
+        'input_hash': rec['input_hash'].decode(),
+        'classification': THEME_CLASSES[rec['classification']],
+        'reason': rec['reason'].decode(),
+        'redirect': rec['redirect'].decode(),
+        'user_bypass': bool(rec['user_bypass'])
+    }
+
+class ProvenanceWriter:
+    """
+    Append-only writer for a fixed-record provenance store.
+    Each record carries sha256(previous chain + record bytes), so any edit,
+    reorder or deletion breaks verification from that point on. A torn
+    trailing record (crash mid-write) is cut off when the file is reopened.
+    Args:
+        path (str): Store file (created with a header if missing)
+        schema (str): 'path' or 'theme'
+    """
+
+    def __init__(self, path, schema='path'):
+        if schema not in SCHEMAS:
+            raise ValueError(f"Unknown schema {schema!r}; expected one of {tuple(SCHEMAS)}")
+        self.path = path
+        self.schema = schema
+        self.dtype = SCHEMAS[schema]
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, SCHEMA_VERSION, 0, self.dtype.itemsize, schema.encode(), _genesis(schema)))
+        header = read_header(path)
+        if header['schema'] != schema:
+            raise ValueError(f"{path}: store holds {header['schema']!r} records, not {schema!r}")
+        self._file = open(path, 'r+b')
+        size = os.fstat(self._file.fileno()).st_size
+        self.count = (size - HEADER_SIZE) // self.dtype.itemsize
+        end = HEADER_SIZE + self.count * self.dtype.itemsize
+        if end != size:
+            self._file.truncate(end)
+        if self.count:
+            self._file.seek(end - CHAIN_SIZE)
+            self.head = self._file.read(CHAIN_SIZE)
+        else:
+            self.head = header['genesis']
+        self._file.seek(end)
+
+    def append(self, entry):
+        """Append one dict-shaped entry. Returns its record index."""
+        return self.append_records([_encode(self.schema, entry)]) - 1
+
+    def append_records(self, rows):
+        """Append many record tuples (fields in schema order, chain omitted). Returns the new count."""
+        records = np.zeros(len(rows), dtype=self.dtype)
+        body_len = self.dtype.itemsize - CHAIN_SIZE
+        head = self.head
+        for i, row in enumerate(rows):
+            records[i] = tuple(row) + (np.zeros(CHAIN_SIZE, dtype=np.uint8),)
+            head = hashlib.sha256(head + records[i:i + 1].tobytes()[:body_len]).digest()
+            records['chain'][i] = np.frombuffer(head, dtype=np.uint8)
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self.head = head
+        self.count += len(rows)
+        return self.count
+
+    def truncate(self, count):
+        """Drop records past `count` (e.g. work done after a checkpoint); the chain prefix stays valid."""
+        if count >= self.count:
+            return
+        end = HEADER_SIZE + count * self.dtype.itemsize
+        self._file.truncate(end)
+        if count:
+            self._file.seek(end - CHAIN_SIZE)
+            self.head = self._file.read(CHAIN_SIZE)
+        else:
+            self.head = read_header(self.path)['genesis']
+        self._file.seek(end)
+        self.count = count
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_store(path):
+    """
+    Memory-map a store for reading without parsing.
+    Returns:
+        tuple: (header dict, read-only structured np.memmap of records)
+    """
+    header = read_header(path)
+    dtype = SCHEMAS[header['schema']]
+    count = (os.path.getsize(path) - HEADER_SIZE) // dtype.itemsize
+    if count == 0:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+def verify_store(path):
+    """
+    Recompute the hash chain.
+    Returns:
+        tuple: (ok, index of the first bad record or None, head hash hex)
+    """
+    header, records = open_store(path)
+    head = header['genesis']
+    body_len = records.dtype.itemsize - CHAIN_SIZE
+    raw = records.view(np.uint8).reshape(len(records), records.dtype.itemsize)
+    for i in range(len(records)):
+        head = hashlib.sha256(head + raw[i, :body_len].tobytes()).digest()
+        if head != raw[i, body_len:].tobytes():
+            return False, i, head.hex()
+    return True, None, head.hex()
+
+def jsonl_to_store(jsonl_path, store_path, schema='theme'):
+    """
+    Convert a JSONL provenance log (e.g. audit_helix_log.jsonl) into a store.
+    Engine batch summaries have no fixed-record form and are skipped.
+    Returns:
+        int: Number of records appended
+    """
+    rows = []
+    with open(jsonl_path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if schema == 'path' and 'batch_size' in entry:
+                continue
+            rows.append(_encode(schema, entry))
+    with ProvenanceWriter(store_path, schema) as writer:
+        writer.append_records(rows)
+    return len(rows)
+
+def store_to_jsonl(store_path, jsonl_path):
+    """Write every record of a store back out as JSONL. Returns the record count."""
+    header, records = open_store(store_path)
+    with open(jsonl_path, 'w') as f:
+        for rec in records:
+            f.write(json.dumps(_decode(header['schema'], rec)) + "\n")
+    return len(records)
+
+class StoreProvenance:
+    """
+    SpiralEngine provenance backend persisting every cycle to a binary store.
+    Batch summaries (variable shape) stay in a bounded in-memory list.
+    Usage: SpiralEngine(provenance=StoreProvenance('run.sprv'))
+    """
+
+    def __init__(self, path, batch_capacity=1024):
+        self.writer = ProvenanceWriter(path, 'path')
+        self.batches = deque(maxlen=batch_capacity)
+        # Batch summaries take cycle numbers but aren't persisted, so resume after the last stored cycle
+        cycles = self.columns()['cycle']
+        self.cursor = int(cycles[-1]) if len(cycles) else 0
+
+    def append(self, params, sign, base, adjustment, value):
+        self.cursor += 1
+        self.writer.append_records([(self.cursor,) + tuple(params) + (1 if sign == '+' else -1, base, adjustment, value)])
+        return self.cursor
+
+    def append_batch(self, record):
+        self.cursor += 1
+        self.batches.append({'cycle': self.cursor, **record})
+        return self.cursor
+
+    def rewind(self, cursor):
+        """Truncate persisted rows after `cursor` and continue numbering from it (checkpoint resume)."""
+        cycles = self.columns()['cycle']
+        self.writer.truncate(int(np.searchsorted(cycles, cursor, side='right')))
+        self.batches = deque((b for b in self.batches if b['cycle'] <= cursor), maxlen=self.batches.maxlen)
+        self.cursor = cursor
+
+    def columns(self):
+        """Zero-copy memory-mapped columns of the persisted rows."""
+        return open_store(self.writer.path)[1]
+
+    def to_dicts(self):
+        rows = [_decode('path', rec) for rec in self.columns()]
+        if not self.batches:
+            return rows
+        return sorted(rows + list(self.batches), key=lambda r: r['cycle'])
+
+    def __len__(self):
+        return self.writer.count + len(self.batches)
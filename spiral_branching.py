@@ -0,0 +1,78 @@
+import numpy as np
+
+from spiral_engine import SpiralEngine, _growth_scales
+
+def cumulative_value(values, signs):
+    """Score: total Path value along the schedule (favours expansive cycles)."""
+    return values.sum(axis=1)
+
+def target_score(target):
+    """Score factory: negative squared error against a target trajectory."""
+    target = np.asarray(target, dtype=float)
+
+    def score(values, signs):
+        return -np.sum((values - target[:values.shape[1]]) ** 2, axis=1)
+    return score
+
+def stability_score(values, signs):
+    """Score: negative variance of cycle-to-cycle steps (smoothest helix)."""
+    if values.shape[1] < 2:
+        return np.zeros(len(values))
+    return -np.var(np.diff(values, axis=1), axis=1)
+
+def helical_beam_search(params, iterations, beam_width=64, top_k=5, score=cumulative_value,
+                        growth_rate=0.01, engine=None):
+    """
+    Search ± sign schedules (expansive/convergent per cycle) with a vectorized beam.
+    Growth does not depend on sign, so the base trajectory is computed once in
+    closed form; each level then doubles the frontier and scores every child
+    in one NumPy op before pruning back to beam_width.
+    Args:
+        params (dict): Initial {'td':, 'rf':, 'tw':, 'cir':, 'am':, 'da':}
+        iterations (int): Number of cycles (schedule length)
+        beam_width (int): Frontier size kept after each level
+        top_k (int): Schedules returned
+        score (callable): score(values, signs) -> (n_candidates,) array, higher is
+            better; values/signs are (n_candidates, level) prefixes
+        growth_rate (float | array-like): Constant growth or per-cycle schedule
+        engine (SpiralEngine): Supplies sc and records provenance (default: new engine)
+    Returns:
+        dict: 'schedules' (list of '+'/'-' strings), 'signs' (top_k x iterations of ±1),
+        'values' (top_k x iterations) and 'scores', best first
+    """
+    if iterations < 1:
+        raise ValueError(f"iterations must be at least 1, got {iterations}")
+    engine = engine or SpiralEngine()
+    td_scale, rf_scale = _growth_scales(iterations, growth_rate)
+    base = (params['td'] * td_scale / (params['rf'] * rf_scale)) * params['tw'] + (params['cir'] * engine.sc)
+    swing = params['am'] * params['da']
+
+    signs = np.zeros((1, 0), dtype=np.int8)
+    values = np.zeros((1, 0))
+    for level in range(iterations):
+        n = len(signs)
+        child_sign = np.repeat(np.array([[1], [-1]], dtype=np.int8), n, axis=0)
+        signs = np.hstack([np.tile(signs, (2, 1)), child_sign])
+        values = np.hstack([np.tile(values, (2, 1)), base[level] + swing * child_sign])
+        scores = score(values, signs)
+        if len(signs) > beam_width:
+            keep = np.argpartition(-scores, beam_width - 1)[:beam_width]
+            signs, values, scores = signs[keep], values[keep], scores[keep]
+
+    order = np.argsort(-scores, kind='stable')[:top_k]
+    signs, values, scores = signs[order], values[order], scores[order]
+    engine._log_batch(np.broadcast_to(base, values.shape), values - base, values, signs)
+    return {
+        'schedules': [''.join('+' if s > 0 else '-' for s in row) for row in signs],
+        'signs': signs,
+        'values': values,
+        'scores': scores
+    }
+
+# Quick Demo
+if __name__ == "__main__":
+    params = {'td': 10.0, 'rf': 2.0, 'tw': 5.0, 'cir': 3.0, 'am': 1.0, 'da': 2.0}
+    # Track a steady ramp: the search must learn when to expand and when to converge
+    best = helical_beam_search(params, iterations=40, beam_width=256, score=target_score(np.linspace(32.0, 34.0, 40)))
+    for schedule, s in zip(best['schedules'], best['scores']):
+        print(f"{schedule}  score={s:.3f}")
@@ -0,0 +1,142 @@
+import os
+import json
+import numpy as np
+
+from spiral_engine import SpiralEngine
+
+CHECKPOINT_VERSION = 1
+RESULT_COLUMNS = ('value', 'base', 'adjustment', 'td', 'rf', 'da')
+
+def _write_checkpoint(path, state):
+    """Atomically replace the checkpoint file (write temp, fsync, rename)."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def _to_json(value):
+    """Bit-generator states hold ndarrays for most generators (MT19937, Philox, SFC64); tag them for JSON."""
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return {'__array__': value.tolist(), 'dtype': str(value.dtype)}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return np.array(value['__array__'], dtype=value['dtype'])
+        return {k: _from_json(v) for k, v in value.items()}
+    return value
+
+def _rng_state(rng):
+    return _to_json(rng.bit_generator.state)
+
+def _restore_rng(rng_state):
+    rng_state = _from_json(rng_state)
+    bit_generator = getattr(np.random, rng_state['bit_generator'])()
+    bit_generator.state = rng_state
+    return np.random.Generator(bit_generator)
+
+def _results_path(checkpoint_path, stored):
+    """Results file recorded in a checkpoint, resolved against the checkpoint's own directory."""
+    return os.path.join(os.path.dirname(os.path.abspath(checkpoint_path)), stored)
+
+def _advance(engine, state, results, rng, checkpoint_path):
+    """Run the remaining cycles, checkpointing every `interval` cycles."""
+    config = state['config']
+    iterations, interval = config['iterations'], config['interval']
+    sign, growth_rate = config['sign'], config['growth_rate']
+    current = state['params']
+    cycle = state['cycle']
+    while cycle < iterations:
+        chunk = min(interval, iterations - cycle)
+        for indicator in engine.iter_spiral(current, chunk, sign, growth_rate, config['noise_level'], rng=rng):
+            p = indicator['params']
+            results[cycle] = (indicator['value'], indicator['base'], indicator['adjustment'], p['td'], p['rf'], p['da'])
+            engine.provenance.append(tuple(p[k] for k in ('td', 'rf', 'tw', 'cir', 'am', 'da')),
+                                     sign, indicator['base'], indicator['adjustment'], indicator['value'])
+            cycle += 1
+        # Same growth step iter_spiral applies after each cycle
+        current = dict(p)
+        current['td'] *= (1 + growth_rate)
+        current['rf'] *= (1 + growth_rate / 2)
+        results.flush()
+        state.update(cycle=cycle, params=current, rng=_rng_state(rng), cursor=engine.provenance.cursor)
+        _write_checkpoint(checkpoint_path, state)
+    return {name: results[:, j] for j, name in enumerate(RESULT_COLUMNS)}
+
+def run_checkpointed(params, iterations, checkpoint_path, interval=10_000, sign='+', growth_rate=0.01,
+                     noise_level=0.05, rng=None, engine=None):
+    """
+    Stochastic simulation (as simulate_spiral_with_indicators) that survives restarts.
+    Every `interval` cycles a compact JSON checkpoint is written atomically with
+    the RNG bit-generator state, current params, cycle index and provenance
+    cursor. Per-cycle outputs go to a memory-mapped '<checkpoint>.npy' file that
+    is flushed before each checkpoint, so a preempted worker loses at most one interval.
+    Args:
+        params (dict): Initial {'td':, 'rf':, 'tw':, 'cir':, 'am':, 'da':}
+        iterations (int): Total cycles
+        checkpoint_path (str): Checkpoint file (results live next to it, recorded relative to it)
+        interval (int): Cycles between checkpoints
+        sign, growth_rate, noise_level: As in simulate_spiral ('+'/'-' and a scalar growth rate)
+        rng (np.random.Generator | int | None): Generator or seed
+        engine (SpiralEngine): Engine whose sc and provenance are used
+    Returns:
+        dict: Per-cycle columns 'value', 'base', 'adjustment', 'td', 'rf', 'da'
+        (views of the memory-mapped results file)
+    """
+    # Validate before any file is created; iter_spiral only takes constant sign/growth
+    if not isinstance(sign, str) or sign not in ('+', '-'):
+        raise ValueError(f"sign must be '+' or '-' for checkpointed runs, got {sign!r}")
+    if np.ndim(growth_rate) != 0:
+        raise ValueError("growth_rate must be a scalar for checkpointed runs (per-cycle schedules aren't supported)")
+    engine = engine or SpiralEngine()
+    rng = np.random.default_rng(rng)
+    results_path = checkpoint_path + '.npy'
+    results = np.lib.format.open_memmap(results_path, mode='w+', dtype=np.float64,
+                                        shape=(iterations, len(RESULT_COLUMNS)))
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'config': {'iterations': iterations, 'interval': interval, 'sign': sign, 'growth_rate': float(growth_rate),
+                   'noise_level': float(noise_level), 'sc': engine.sc,
+                   'results': os.path.basename(results_path)},  # Relative to the checkpoint's directory
+        'cycle': 0,
+        'params': {k: float(v) for k, v in params.items()},
+        'rng': _rng_state(rng),
+        'cursor': engine.provenance.cursor
+    }
+    _write_checkpoint(checkpoint_path, state)
+    return _advance(engine, state, results, rng, checkpoint_path)
+
+def resume(checkpoint_path, engine=None):
+    """
+    Continue a run from its last checkpoint; the completed trajectory is
+    bit-for-bit identical to an uninterrupted run. Provenance recorded after
+    the checkpoint is rewound so cycle numbering stays contiguous.
+    Args:
+        checkpoint_path (str): File written by run_checkpointed
+        engine (SpiralEngine): Engine to continue logging into (default: new engine with the saved sc)
+    Returns:
+        dict: Same columns as run_checkpointed
+    """
+    with open(checkpoint_path) as f:
+        state = json.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"{checkpoint_path}: unsupported checkpoint version {state.get('version')}")
+    engine = engine or SpiralEngine(sc=state['config']['sc'])
+    engine.provenance.rewind(state['cursor'])
+    results = np.load(_results_path(checkpoint_path, state['config']['results']), mmap_mode='r+')
+    return _advance(engine, state, results, _restore_rng(state['rng']), checkpoint_path)
+
+# Quick Demo
+if __name__ == "__main__":
+    params = {'td': 10.0, 'rf': 2.0, 'tw': 5.0, 'cir': 3.0, 'am': 1.0, 'da': 2.0}
+    full = run_checkpointed(params, 50_000, 'spiral_run.ckpt', interval=5_000, rng=42)
+    print("Final value:", full['value'][-1])
+    resumed = resume('spiral_run.ckpt')  # Already complete: returns the stored results
+    print("Resumed final value:", resumed['value'][-1])
@@ -1,5 +1,111 @@
+import time
+import warnings
 import numpy as np
 import matplotlib.pyplot as plt  # Optional for visualization
+from spiral_provenance import PARAM_FIELDS, RingBufferProvenance
+
+def _sign_factor(sign):
+    """Map '+'/'-' (scalar or array) or numeric signs to +1.0/-1.0 factors."""
+    s = np.asarray(sign)
+    if s.dtype.kind == 'S':
+        return np.where(s == b'+', 1.0, -1.0)
+    if s.dtype.kind in 'UO':
+        return np.where(s == '+', 1.0, -1.0)
+    return np.where(s > 0, 1.0, -1.0)
+
+def _summarize(arr):
+    """Compact mean/min/max summary for batch provenance."""
+    arr = np.asarray(arr)
+    if arr.size == 0:
+        return {'mean': None, 'min': None, 'max': None}
+    return {'mean': float(np.mean(arr)), 'min': float(np.min(arr)), 'max': float(np.max(arr))}
+
+def _schedule(name, value, shape):
+    """Broadcast a constant or per-cycle schedule to `shape`; a length mismatch gets a clear error."""
+    try:
+        return np.broadcast_to(value, shape)
+    except ValueError:
+        raise ValueError(f"{name} schedule has shape {np.shape(value)} but {shape[-1]} iterations were requested "
+                         f"(schedule length != iterations)") from None
+
+def _growth_scales(iterations, growth_rate):
+    """Cumulative td and rf growth factors per cycle (constant rate or per-cycle schedule)."""
+    if np.ndim(growth_rate) == 0:
+        cycles = np.arange(iterations)
+        return (1 + growth_rate) ** cycles, (1 + growth_rate / 2) ** cycles
+    growth = _schedule('growth_rate', np.asarray(growth_rate, dtype=float), (iterations,))
+    td_scale = np.ones(iterations)
+    rf_scale = np.ones(iterations)
+    np.cumprod(1 + growth[:-1], out=td_scale[1:])
+    np.cumprod(1 + growth[:-1] / 2, out=rf_scale[1:])
+    return td_scale, rf_scale
+
+def _evolve(params, sc, z_td, z_da, sign='+', growth_rate=0.01, noise_level=0.05):
+    """
+    Advance many independent runs in lockstep; each cycle is one array op over runs.
+    Params may be scalars or per-run arrays of shape (n_runs,); z_td/z_da are
+    standard-normal draws of shape (n_runs, iterations).
+    """
+    n_runs, iterations = z_td.shape
+    shape = (n_runs, iterations)
+    growth = _schedule('growth_rate', np.asarray(growth_rate, dtype=float), shape)
+    factor = _schedule('sign', _sign_factor(sign), shape)
+    td, rf, tw, cir, am, da = (np.array(np.broadcast_to(np.asarray(params[k], dtype=float), (n_runs,))) for k in PARAM_FIELDS)
+    out = {k: np.empty(shape) for k in ('td', 'rf', 'da', 'base', 'adjustment', 'value')}
+    for i in range(iterations):
+        if noise_level > 0:
+            td += noise_level * td * z_td[:, i]
+            da += noise_level * da * z_da[:, i]
+            np.maximum(td, 0.1, out=td)
+            np.maximum(da, 0.1, out=da)
+        base = (td / rf) * tw + (cir * sc)
+        adjustment = factor[:, i] * (am * da)
+        out['td'][:, i] = td
+        out['rf'][:, i] = rf
+        out['da'][:, i] = da
+        out['base'][:, i] = base
+        out['adjustment'][:, i] = adjustment
+        out['value'][:, i] = base + adjustment
+        td *= 1 + growth[:, i]
+        rf *= 1 + growth[:, i] / 2
+    return out
+
+class RelativeDelta:
+    """Stop criterion: |Δvalue| / |value| below tol for `patience` consecutive cycles."""
+    
+    def __init__(self, tol=1e-6, patience=1):
+        self.tol = tol
+        self.patience = patience
+        self.reset()
+    
+    def reset(self):
+        self._prev = None
+        self._streak = 0
+    
+    def __call__(self, indicator):
+        value, prev = indicator['value'], self._prev
+        self._prev = value
+        if prev is None:
+            return False
+        delta = abs(value - prev) / max(abs(value), 1e-12)
+        self._streak = self._streak + 1 if delta < self.tol else 0
+        return self._streak >= self.patience
+
+class MaxWallTime:
+    """Stop criterion: wall-clock budget in seconds, counted from the first cycle."""
+    
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.reset()
+    
+    def reset(self):
+        self._start = None
+    
+    def __call__(self, indicator):
+        now = time.perf_counter()
+        if self._start is None:
+            self._start = now
+        return now - self._start >= self.seconds
 
 class SpiralEngine:
     """
@@ -7,9 +113,29 @@ class SpiralEngine:
     Computes (TD / RF) * TW + (CIR * SC) ± (AM * DA) for iterative spirals.
     """
     
-    def __init__(self, sc=1.618):  # Default Spiral Constant: golden ratio φ
+    def __init__(self, sc=1.618, provenance=None):  # Default Spiral Constant: golden ratio φ
         self.sc = sc
-        self.log = []  # Provenance tracking: iterations and values
+        # Provenance tracking: bounded columnar log unless a backend is supplied
+        self.provenance = provenance if provenance is not None else RingBufferProvenance()
+    
+    @property
+    def log(self):
+        """Deprecated read-only snapshot of the provenance; use get_provenance() and clear_log()."""
+        warnings.warn("SpiralEngine.log is deprecated and read-only; use get_provenance() to read it "
+                      "and clear_log() to reset it", DeprecationWarning, stacklevel=2)
+        return tuple(self.provenance.to_dicts())  # Tuple, so legacy log.append(...) fails loudly
+    
+    @log.setter
+    def log(self, records):
+        # Legacy `engine.log = []` resets; records themselves only go in through the provenance backend
+        if len(records):
+            raise ValueError("SpiralEngine.log can only be reset (engine.log = []); use clear_log()")
+        warnings.warn("Assigning SpiralEngine.log is deprecated; use clear_log()", DeprecationWarning, stacklevel=2)
+        self.clear_log()
+    
+    def clear_log(self):
+        """Drop all provenance records and restart cycle numbering (in-memory backends)."""
+        self.provenance.clear()
     
     def compute_path(self, td, rf, tw, cir, am, da, sign='+'):
         """
@@ -28,16 +154,46 @@ class SpiralEngine:
         base = (td / rf) * tw + (cir * self.sc)
         adjustment = am * da if sign == '+' else -(am * da)
         path_value = base + adjustment
-        self.log.append({
-            'cycle': len(self.log) + 1,
-            'params': {'td': td, 'rf': rf, 'tw': tw, 'cir': cir, 'am': am, 'da': da},
-            'sign': sign,
-            'base': base,
-            'adjustment': adjustment,
-            'value': path_value
-        })
+        self.provenance.append((td, rf, tw, cir, am, da), sign, base, adjustment, path_value)
         return path_value
     
+    def compute_path_batch(self, td, rf=None, tw=None, cir=None, am=None, da=None, sign='+'):
+        """
+        Vectorized computation of many cycles in one pass.
+        Args:
+            td (array-like | dict | structured array): Task Density column, or a
+                dict / structured array holding all of 'td', 'rf', 'tw', 'cir', 'am', 'da'
+                (and optionally 'sign') when the remaining args are omitted.
+            rf, tw, cir, am, da (array-like): Remaining Path params (broadcastable).
+            sign (str | array-like): '+'/'-' per row, or numeric (>0 expansive, else convergent).
+        Returns:
+            dict: 'value', 'base', 'adjustment' arrays (one entry per row).
+        """
+        if rf is None:
+            columns = td
+            names = columns.dtype.names if isinstance(columns, np.ndarray) else tuple(columns)
+            if 'sign' in names:
+                sign = columns['sign']
+            td, rf, tw, cir, am, da = (columns[k] for k in PARAM_FIELDS)
+        td, rf, tw, cir, am, da = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (td, rf, tw, cir, am, da)))
+        base = (td / rf) * tw + (cir * self.sc)
+        adjustment = _sign_factor(sign) * (am * da)
+        path_value = base + adjustment
+        self._log_batch(base, adjustment, path_value, sign)
+        return {'value': path_value, 'base': base, 'adjustment': adjustment}
+    
+    def _log_batch(self, base, adjustment, value, sign):
+        """Record one summary provenance entry for a vectorized call."""
+        factor = np.broadcast_to(_sign_factor(sign), np.shape(value))
+        n_plus = int(np.count_nonzero(factor > 0))
+        self.provenance.append_batch({
+            'batch_size': int(np.size(value)),
+            'sign': {'+': n_plus, '-': int(np.size(value)) - n_plus},
+            'base': _summarize(base),
+            'adjustment': _summarize(adjustment),
+            'value': _summarize(value)
+        })
+    
     def simulate_spiral(self, params, iterations=5, sign='+', growth_rate=0.01, noise_level=0.05):
         """
         Multi-cycle simulation with optional growth and stochastic noise.
@@ -71,37 +227,119 @@ class SpiralEngine:
             current_params['rf'] *= (1 + growth_rate / 2)
         return values
     
-    def simulate_spiral_with_indicators(self, params, iterations=5, sign='+', growth_rate=0.01, noise_level=0.05):
+    def simulate_spiral_deterministic(self, params, iterations=None, sign='+', growth_rate=0.01):
         """
-        Multi-cycle simulation with detailed path indicators per iteration.
-        Returns values and a list of dicts with base, adjustment, value per cycle.
+        Noise-free simulation computed in closed form over the whole horizon.
+        Matches simulate_spiral(..., noise_level=0) without the per-cycle loop.
+        Args:
+            params (dict): Initial {'td':, 'rf':, 'tw':, 'cir':, 'am':, 'da':}
+            iterations (int): Number of cycles (None: inferred from array schedules,
+                else 5 as in simulate_spiral)
+            sign (str | array-like): '+'/'-' for all cycles, or a per-cycle schedule
+            growth_rate (float | array-like): Constant growth, or per-cycle schedule
+                (entry i is applied after cycle i; the last entry is unused)
+        Returns:
+            np.ndarray: Path values over iterations
         """
-        values = []
-        indicators = []
+        if iterations is None:
+            schedules = [np.size(x) for x in (sign, growth_rate) if np.ndim(x) > 0]
+            iterations = max(schedules) if schedules else 5
+        td_scale, rf_scale = _growth_scales(iterations, growth_rate)
+        base = (params['td'] * td_scale / (params['rf'] * rf_scale)) * params['tw'] + (params['cir'] * self.sc)
+        adjustment = _schedule('sign', _sign_factor(sign), (iterations,)) * (params['am'] * params['da'])
+        values = base + adjustment
+        self._log_batch(base, adjustment, values, sign)
+        return values
+    
+    def simulate_ensemble(self, params, n_runs, iterations=5, sign='+', growth_rate=0.01, noise_level=0.05,
+                          rng=None, quantiles=(0.05, 0.5, 0.95)):
+        """
+        Monte Carlo ensemble of stochastic spirals, vectorized across runs.
+        All noise is drawn up front as (n_runs x iterations) matrices from one
+        Generator, so results are reproducible bit-for-bit from the seed.
+        Args:
+            params (dict): Initial {'td':, 'rf':, 'tw':, 'cir':, 'am':, 'da':}
+            n_runs (int): Number of independent runs
+            iterations (int): Number of cycles per run
+            sign (str | array-like): '+'/'-' or a per-cycle schedule
+            growth_rate (float | array-like): Constant growth or per-cycle schedule
+            noise_level (float): Std dev (relative) of Gaussian jitter on td and da
+            rng (np.random.Generator | int | None): Generator or seed
+            quantiles (tuple): Quantile levels for the summary bands
+        Returns:
+            dict: 'values' (n_runs x iterations), per-cycle indicator arrays
+            'base', 'adjustment', 'td', 'rf', 'da' of the same shape, and
+            'quantiles' mapping each level to a per-cycle array.
+        """
+        rng = np.random.default_rng(rng)
+        z_td, z_da = rng.standard_normal((2, n_runs, iterations))
+        out = _evolve(params, self.sc, z_td, z_da, sign, growth_rate, noise_level)
+        self._log_batch(out['base'], out['adjustment'], out['value'], sign)
+        bands = np.quantile(out['value'], quantiles, axis=0)
+        return {
+            'values': out['value'],
+            'base': out['base'],
+            'adjustment': out['adjustment'],
+            'td': out['td'],
+            'rf': out['rf'],
+            'da': out['da'],
+            'quantiles': {q: band for q, band in zip(quantiles, bands)}
+        }
+    
+    def iter_spiral(self, params, iterations=None, sign='+', growth_rate=0.01, noise_level=0.05, stop=None, rng=None):
+        """
+        Lazy multi-cycle simulation: yields one indicator dict per cycle.
+        Args:
+            params (dict): Initial {'td':, 'rf':, 'tw':, 'cir':, 'am':, 'da':}
+            iterations (int | None): Max cycles (None runs until a stop criterion fires)
+            sign (str): '+' or '-'
+            growth_rate (float): Parametric evolution per cycle
+            noise_level (float): Std dev for Gaussian noise on td/da per cycle
+            stop (callable | list): Criteria called with each indicator dict after it
+                is yielded; iteration ends once any returns True (e.g. RelativeDelta,
+                MaxWallTime, or any predicate function)
+            rng (np.random.Generator | None): Noise source (None uses the global np.random)
+        Yields:
+            dict: cycle, base, adjustment, value, params
+        """
+        criteria = [] if stop is None else (list(stop) if isinstance(stop, (list, tuple)) else [stop])
+        for criterion in criteria:
+            if hasattr(criterion, 'reset'):
+                criterion.reset()
+        normal = np.random.normal if rng is None else rng.normal
         current_params = params.copy()
-        for i in range(iterations):
+        cycle = 0
+        while iterations is None or cycle < iterations:
             if noise_level > 0:
-                current_params['td'] += np.random.normal(0, noise_level * current_params['td'])
-                current_params['da'] += np.random.normal(0, noise_level * current_params['da'])
+                current_params['td'] += normal(0, noise_level * current_params['td'])
+                current_params['da'] += normal(0, noise_level * current_params['da'])
                 current_params['td'] = max(0.1, current_params['td'])
                 current_params['da'] = max(0.1, current_params['da'])
             
             base = (current_params['td'] / current_params['rf']) * current_params['tw'] + (current_params['cir'] * self.sc)
             adjustment = current_params['am'] * current_params['da'] if sign == '+' else -(current_params['am'] * current_params['da'])
-            path_value = base + adjustment
-            
-            indicators.append({
-                'cycle': i + 1,
+            cycle += 1
+            indicator = {
+                'cycle': cycle,
                 'base': base,
                 'adjustment': adjustment,
-                'value': path_value,
+                'value': base + adjustment,
                 'params': current_params.copy()
-            })
-            values.append(path_value)
+            }
+            yield indicator
+            if any(criterion(indicator) for criterion in criteria):
+                return
             
             current_params['td'] *= (1 + growth_rate)
             current_params['rf'] *= (1 + growth_rate / 2)
-        return values, indicators
+    
+    def simulate_spiral_with_indicators(self, params, iterations=5, sign='+', growth_rate=0.01, noise_level=0.05, rng=None):
+        """
+        Multi-cycle simulation with detailed path indicators per iteration.
+        Returns values and a list of dicts with base, adjustment, value per cycle.
+        """
+        indicators = list(self.iter_spiral(params, iterations, sign, growth_rate, noise_level, rng=rng))
+        return [ind['value'] for ind in indicators], indicators
     
     def visualize_spiral(self, values, title='Spiral Path Evolution'):
         """Optional plot of simulation values."""
@@ -116,8 +354,8 @@ class SpiralEngine:
         print("Viz saved as spiral_viz.png")
     
     def get_provenance(self):
-        """Return log for traceability."""
-        return self.log
+        """Return log for traceability (list of dicts, oldest first)."""
+        return self.provenance.to_dicts()
 
 # Quick Demo (run in examples/)
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+import numpy as np
+from collections import deque
+
+PARAM_FIELDS = ('td', 'rf', 'tw', 'cir', 'am', 'da')
+EVICTION_POLICIES = ('overwrite', 'drop', 'raise')
+
+class ListProvenance:
+    """
+    Legacy provenance backend: an unbounded list of per-cycle dicts.
+    Kept for callers that want every record as a plain Python structure.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.cursor = 0  # Total cycles recorded (rows + batches)
+
+    def append(self, params, sign, base, adjustment, value):
+        """Record one cycle; params is a (td, rf, tw, cir, am, da) sequence."""
+        self.cursor += 1
+        self.records.append({
+            'cycle': self.cursor,
+            'params': dict(zip(PARAM_FIELDS, params)),
+            'sign': sign,
+            'base': base,
+            'adjustment': adjustment,
+            'value': value
+        })
+        return self.cursor
+
+    def append_batch(self, record):
+        """Record one summary entry for a vectorized call."""
+        self.cursor += 1
+        self.records.append({'cycle': self.cursor, **record})
+        return self.cursor
+
+    def to_dicts(self):
+        return self.records
+
+    def rewind(self, cursor):
+        """Discard records after `cursor` and continue numbering from it (checkpoint resume)."""
+        self.records = [r for r in self.records if r['cycle'] <= cursor]
+        self.cursor = cursor
+
+    def clear(self):
+        self.records = []
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.records)
+
+class RingBufferProvenance:
+    """
+    Bounded struct-of-arrays provenance log.
+    Per-cycle rows live in preallocated NumPy columns (cycle, params, sign,
+    base, adjustment, value) used as a ring buffer; batch summaries are kept
+    in a small bounded side list. Memory stays constant for the engine's lifetime.
+    Args:
+        capacity (int): Number of per-cycle rows retained
+        eviction (str): Policy when full: 'overwrite' the oldest row,
+            'drop' the incoming row, or 'raise' OverflowError
+        batch_capacity (int): Number of batch summary records retained
+    """
+
+    def __init__(self, capacity=100_000, eviction='overwrite', batch_capacity=1024):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"eviction must be one of {EVICTION_POLICIES}, got {eviction!r}")
+        if int(capacity) < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity!r}")
+        self.capacity = int(capacity)
+        self.eviction = eviction
+        self.cycle = np.zeros(self.capacity, dtype=np.int64)
+        self.params = np.zeros((self.capacity, len(PARAM_FIELDS)))
+        self.sign = np.zeros(self.capacity, dtype=np.int8)
+        self.base = np.zeros(self.capacity)
+        self.adjustment = np.zeros(self.capacity)
+        self.value = np.zeros(self.capacity)
+        self.batches = deque(maxlen=batch_capacity)
+        self.cursor = 0  # Total cycles recorded (rows + batches)
+        self.evicted = 0  # Rows overwritten ('overwrite') or discarded ('drop')
+        self._head = 0  # Next write slot
+        self._size = 0
+
+    def append(self, params, sign, base, adjustment, value):
+        """Record one cycle; params is a (td, rf, tw, cir, am, da) sequence."""
+        if self._size == self.capacity:
+            if self.eviction == 'raise':
+                raise OverflowError(f"Provenance buffer full ({self.capacity} rows)")
+            self.evicted += 1
+            if self.eviction == 'drop':
+                self.cursor += 1
+                return self.cursor
+        self.cursor += 1
+        i = self._head
+        self.cycle[i] = self.cursor
+        self.params[i] = params
+        self.sign[i] = 1 if sign == '+' else -1
+        self.base[i] = base
+        self.adjustment[i] = adjustment
+        self.value[i] = value
+        self._head = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return self.cursor
+
+    def append_batch(self, record):
+        """Record one summary entry for a vectorized call."""
+        self.cursor += 1
+        self.batches.append({'cycle': self.cursor, **record})
+        return self.cursor
+
+    def segments(self):
+        """
+        Index spans of the retained rows in chronological order: one
+        (start, stop) pair, or two once the buffer has wrapped. Slicing the
+        column arrays with them always yields zero-copy views.
+        """
+        start = (self._head - self._size) % self.capacity
+        if start + self._size <= self.capacity:
+            return [(start, start + self._size)]
+        return [(start, self.capacity), (0, self._head)]
+
+    def columns(self):
+        """
+        Chronological column views: 'cycle', 'sign', 'base', 'adjustment', 'value',
+        'params' (rows x 6) plus one entry per param name. Views are zero-copy
+        while the retained rows are contiguous; after wrap-around they are
+        stitched together (a copy). Use segments() to stay zero-copy always.
+        """
+        names = ('cycle', 'params', 'sign', 'base', 'adjustment', 'value')
+        spans = self.segments()
+        if len(spans) == 1:
+            a, b = spans[0]
+            cols = {name: getattr(self, name)[a:b] for name in names}
+        else:
+            cols = {name: np.concatenate([getattr(self, name)[a:b] for a, b in spans]) for name in names}
+        for j, name in enumerate(PARAM_FIELDS):
+            cols[name] = cols['params'][:, j]
+        return cols
+
+    def to_dicts(self):
+        """Legacy list-of-dicts view (rows and batch summaries, ordered by cycle)."""
+        cols = self.columns()
+        rows = [{
+            'cycle': int(cycle),
+            'params': dict(zip(PARAM_FIELDS, params.tolist())),
+            'sign': '+' if sign > 0 else '-',
+            'base': float(base),
+            'adjustment': float(adjustment),
+            'value': float(value)
+        } for cycle, params, sign, base, adjustment, value in zip(
+            cols['cycle'], cols['params'], cols['sign'], cols['base'], cols['adjustment'], cols['value'])]
+        if not self.batches:
+            return rows
+        return sorted(rows + list(self.batches), key=lambda r: r['cycle'])
+
+    def rewind(self, cursor):
+        """Discard records after `cursor` and continue numbering from it (checkpoint resume)."""
+        while self._size and self.cycle[(self._head - 1) % self.capacity] > cursor:
+            self._head = (self._head - 1) % self.capacity
+            self._size -= 1
+        self.batches = deque((b for b in self.batches if b['cycle'] <= cursor), maxlen=self.batches.maxlen)
+        self.cursor = cursor
+
+    def clear(self):
+        self.batches.clear()
+        self.cursor = 0
+        self.evicted = 0
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size + len(self.batches)
@@ -0,0 +1,184 @@
+import csv
+import threading
+import itertools
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+
+from spiral_engine import _evolve, _sign_factor
+from spiral_provenance import PARAM_FIELDS
+
+SWEEP_FIELDS = PARAM_FIELDS + ('sc', 'sign', 'growth_rate')
+DEFAULTS = {'td': 10.0, 'rf': 2.0, 'tw': 5.0, 'cir': 3.0, 'am': 1.0, 'da': 2.0,
+            'sc': 1.618, 'sign': '+', 'growth_rate': 0.01}
+METRICS = ('final', 'mean', 'min', 'max', 'final_std')
+
+def grid_design(space):
+    """
+    Full factorial design.
+    Args:
+        space (dict): {field: sequence of values}
+    Returns:
+        dict: Equal-length column arrays, one row per grid point
+    """
+    names = list(space)
+    rows = list(itertools.product(*(space[k] for k in names)))
+    return {k: np.array([r[j] for r in rows]) for j, k in enumerate(names)}
+
+def _sample_column(spec, u):
+    """Map uniform [0, 1) draws onto a (low, high) range or a list of choices."""
+    if isinstance(spec, tuple):
+        low, high = spec
+        return low + u * (high - low)
+    choices = np.asarray(spec)
+    return choices[np.minimum((u * len(choices)).astype(int), len(choices) - 1)]
+
+def random_design(space, n, rng=None):
+    """
+    Uniform random design.
+    Args:
+        space (dict): {field: (low, high) range tuple or list of discrete choices}
+        n (int): Number of rows
+        rng (np.random.Generator | int | None): Generator or seed
+    """
+    rng = np.random.default_rng(rng)
+    return {k: _sample_column(spec, rng.random(n)) for k, spec in space.items()}
+
+def latin_hypercube_design(space, n, rng=None):
+    """
+    Latin-hypercube design: each field's range is cut into n strata and every
+    stratum is sampled exactly once (discrete choices are stratified likewise).
+    Args mirror random_design.
+    """
+    rng = np.random.default_rng(rng)
+    return {k: _sample_column(spec, (rng.permutation(n) + rng.random(n)) / n) for k, spec in space.items()}
+
+def _run_shard(columns, iterations, noise_level, n_runs, seed_seq):
+    """Worker: evaluate one shard of design rows (n_runs replicates each) in a vectorized pass."""
+    rows = len(columns['td'])
+    cols = {k: np.repeat(v, n_runs) for k, v in columns.items()}
+    if noise_level > 0:
+        z_td, z_da = np.random.default_rng(seed_seq).standard_normal((2, rows * n_runs, iterations))
+    else:
+        z_td = z_da = np.zeros((rows * n_runs, iterations))
+    out = _evolve(cols, cols['sc'], z_td, z_da, cols['sign'][:, None], cols['growth_rate'][:, None], noise_level)
+    values = out['value'].reshape(rows, n_runs, iterations)
+    mean_traj = values.mean(axis=1)
+    return {
+        'final': mean_traj[:, -1],
+        'mean': mean_traj.mean(axis=1),
+        'min': mean_traj.min(axis=1),
+        'max': mean_traj.max(axis=1),
+        'final_std': values[:, :, -1].std(axis=1)
+    }
+
+class SpiralSweep:
+    """
+    Parallel parameter sweep over (td, rf, tw, cir, am, da, sc, sign, growth_rate).
+    The design is split into fixed-size shards, each with its own RNG stream
+    spawned from one SeedSequence, so results do not depend on worker count.
+    Shards run on a ProcessPoolExecutor and land in one structured NumPy table.
+    Args:
+        design (dict): Column arrays (see grid_design / random_design / latin_hypercube_design);
+            fields not in the design take base_params or DEFAULTS values
+        base_params (dict): Fixed values for fields absent from the design
+        iterations (int): Cycles per simulation
+        noise_level (float): Jitter on td/da as in simulate_spiral (0 = deterministic)
+        n_runs (int): Stochastic replicates per design row
+        seed (int | None): Root entropy for the SeedSequence
+        workers (int | None): Process count (None = all cores, 1 = run in-process)
+        shard_size (int): Design rows per task
+        progress (callable): progress(done_rows, total_rows) called as shards finish
+    """
+
+    def __init__(self, design, base_params=None, iterations=5, noise_level=0.0, n_runs=1, seed=None,
+                 workers=None, shard_size=4096, progress=None):
+        n = len(next(iter(design.values())))
+        fixed = {**DEFAULTS, **(base_params or {})}
+        self.columns = {k: np.asarray(design[k]) if k in design else np.full(n, fixed[k]) for k in SWEEP_FIELDS}
+        self.columns['sign'] = np.where(_sign_factor(self.columns['sign']) > 0, '+', '-')  # Numeric signs too
+        self.n_rows = n
+        self.iterations = iterations
+        self.noise_level = noise_level
+        self.n_runs = n_runs
+        self.seed = seed
+        self.workers = workers
+        self.shard_size = shard_size
+        self.progress = progress
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Stop scheduling shards; run() returns with the rows finished so far."""
+        self._cancel.set()
+
+    def _shards(self):
+        bounds = range(0, self.n_rows, self.shard_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(bounds))
+        for start, seed_seq in zip(bounds, seeds):
+            stop = min(start + self.shard_size, self.n_rows)
+            cols = {k: v[start:stop] for k, v in self.columns.items()}
+            yield start, stop, (cols, self.iterations, self.noise_level, self.n_runs, seed_seq)
+
+    def run(self):
+        """
+        Execute the sweep.
+        Returns:
+            np.ndarray: Structured table with the design fields, the metrics
+            (final, mean, min, max of the run-averaged trajectory; final_std across
+            replicates) and a 'completed' flag (False for rows skipped by cancel()).
+        """
+        dtype = [(k, 'U1' if k == 'sign' else 'f8') for k in SWEEP_FIELDS]
+        dtype += [(m, 'f8') for m in METRICS] + [('completed', '?')]
+        table = np.zeros(self.n_rows, dtype=dtype)
+        for k in SWEEP_FIELDS:
+            table[k] = self.columns[k]
+        for m in METRICS:
+            table[m] = np.nan
+        done = 0
+
+        def collect(start, stop, result):
+            nonlocal done
+            for m in METRICS:
+                table[m][start:stop] = result[m]
+            table['completed'][start:stop] = True
+            done += stop - start
+            if self.progress is not None:
+                self.progress(done, self.n_rows)
+
+        if self.workers == 1:
+            for start, stop, args in self._shards():
+                if self._cancel.is_set():
+                    break
+                collect(start, stop, _run_shard(*args))
+            return table
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(_run_shard, *args): (start, stop) for start, stop, args in self._shards()}
+            while pending:
+                finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    collect(*pending.pop(fut), fut.result())
+                if self._cancel.is_set():
+                    for fut in pending:
+                        fut.cancel()
+                    break
+        return table
+
+def run_sweep(design, **kwargs):
+    """Convenience wrapper: SpiralSweep(design, **kwargs).run()."""
+    return SpiralSweep(design, **kwargs).run()
+
+def save_csv(table, path):
+    """Write a sweep table to CSV (one row per design point)."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(table.dtype.names)
+        writer.writerows(row.tolist() for row in table)
+
+# Quick Demo
+if __name__ == "__main__":
+    design = latin_hypercube_design({'td': (5.0, 20.0), 'rf': (1.0, 3.0), 'da': (0.5, np.pi / 2),
+                                     'sign': ['+', '-'], 'growth_rate': (0.0, 0.05)}, n=20000, rng=7)
+    table = run_sweep(design, iterations=10, noise_level=0.05, n_runs=8, seed=7,
+                      progress=lambda done, total: print(f"  {done}/{total} rows"))
+    best = table[np.argmax(table['final'])]
+    print("Top final value:", best['final'], "at", {k: best[k] for k in SWEEP_FIELDS})
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Flat modules live at the repo root, in Auditors/ and in extensions/physics/ (no packages)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ('', 'Auditors', os.path.join('extensions', 'physics')):
+    path = os.path.join(ROOT, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
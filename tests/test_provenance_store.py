@@ -0,0 +1,36 @@
+import numpy as np
+
+from provenance_store import StoreProvenance
+
+PARAMS = (10.0, 2.0, 5.0, 3.0, 1.0, 2.0)
+
+def test_cycles_keep_increasing_across_reopen(tmp_path):
+    path = str(tmp_path / 'run.sprv')
+    store = StoreProvenance(path)
+    store.append(PARAMS, '+', 1.0, 2.0, 3.0)
+    store.append(PARAMS, '+', 1.0, 2.0, 3.0)
+    store.append_batch({'batch_size': 3})  # Takes cycle 3, never persisted
+    store.append(PARAMS, '-', 1.0, -2.0, -1.0)
+    store.append_batch({'batch_size': 2})
+    store.writer.close()
+
+    reopened = StoreProvenance(path)
+    reopened.append(PARAMS, '+', 1.0, 2.0, 3.0)
+    cycles = reopened.columns()['cycle']
+    reopened.writer.close()
+    assert list(cycles) == [1, 2, 4, 5]
+    assert np.all(np.diff(cycles) > 0)
+
+def test_rewind_after_reopen(tmp_path):
+    path = str(tmp_path / 'run.sprv')
+    store = StoreProvenance(path)
+    for _ in range(3):
+        store.append(PARAMS, '+', 1.0, 2.0, 3.0)
+    store.writer.close()
+
+    reopened = StoreProvenance(path)
+    reopened.rewind(2)
+    reopened.append(PARAMS, '-', 1.0, -2.0, -1.0)
+    cycles = list(reopened.columns()['cycle'])
+    reopened.writer.close()
+    assert cycles == [1, 2, 3]
@@ -0,0 +1,46 @@
+import numpy as np
+
+import tavis_spiral
+from sim_cache import SimCache
+
+BASE = {
+    'omega_0': 1.0, 'omega_c': 1.0, 'g_base': 0.2, 'T': 5.0, 'D': 1.5,
+    'omega': 2 * np.pi, 'lambda_decay': 0.1, 'C': 0.5, 'hbar': 1.0,
+    'n_times': 50, 'cav_dim': 4, 'num_atoms': 1
+}
+
+def _same(a, b):
+    if isinstance(a, dict):
+        assert set(a) == set(b)
+        for k in a:
+            _same(a[k], b[k])
+    elif isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        assert isinstance(a, np.ndarray) and isinstance(b, np.ndarray)
+        np.testing.assert_array_equal(a, b)
+    else:
+        assert a == b
+
+def test_hit_matches_miss_for_batch_results(tmp_path):
+    cache = SimCache(str(tmp_path))
+    sets = [dict(BASE, g_base=g) for g in (0.1, 0.2)]
+    miss = cache.run(sets, tavis_spiral.simulate_rabi_batch)
+    hit = cache.run(sets, tavis_spiral.simulate_rabi_batch)
+    assert cache.stats['hits'] == 1
+    _same(miss['solver'], hit['solver'])
+    np.testing.assert_array_equal(miss['n'], hit['n'])
+
+def test_observable_lambdas_get_distinct_keys(tmp_path):
+    cache = SimCache(str(tmp_path))
+    a = cache.run(dict(BASE, observables={'x': lambda psi, ph, ex: np.abs(psi)**2 @ (ph + 1)}))
+    b = cache.run(dict(BASE, observables={'x': lambda psi, ph, ex: np.abs(psi)**2 @ (ph + 2)}))
+    assert cache.stats['hits'] == 0
+    assert not np.allclose(a['observables']['x'], b['observables']['x'])
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = SimCache(str(tmp_path))
+    cache.run(BASE)
+    (entry,) = tmp_path.glob('*.npz')
+    entry.write_bytes(b'not a zip file')
+    res = cache.run(BASE)
+    assert cache.stats['misses'] == 2 and cache.stats['hits'] == 0
+    assert len(res['n']) == BASE['n_times']
@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pytest
+
+import spiral_checkpoint
+from spiral_checkpoint import run_checkpointed, resume
+from spiral_engine import SpiralEngine
+
+PARAMS = {'td': 10.0, 'rf': 2.0, 'tw': 5.0, 'cir': 3.0, 'am': 1.0, 'da': 2.0}
+
+class Preempted(Exception):
+    pass
+
+def _crash_after(monkeypatch, checkpoints):
+    """Let `checkpoints` checkpoint writes land, then kill the run like a preempted worker."""
+    write = spiral_checkpoint._write_checkpoint
+    calls = []
+
+    def flaky(path, state):
+        write(path, state)
+        calls.append(path)
+        if len(calls) == checkpoints:
+            raise Preempted
+    monkeypatch.setattr(spiral_checkpoint, '_write_checkpoint', flaky)
+
+@pytest.mark.parametrize('rng', [42, np.random.Generator(np.random.MT19937(7)), np.random.Generator(np.random.Philox(7))])
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch, rng):
+    seed_state = rng.bit_generator.state if isinstance(rng, np.random.Generator) else rng
+    def fresh_rng():
+        if isinstance(seed_state, dict):
+            bit_generator = getattr(np.random, seed_state['bit_generator'])()
+            bit_generator.state = seed_state
+            return np.random.Generator(bit_generator)
+        return seed_state
+
+    full = run_checkpointed(PARAMS, 1000, str(tmp_path / 'full.ckpt'), interval=100, rng=fresh_rng())
+    expected = {k: np.array(v) for k, v in full.items()}
+
+    with monkeypatch.context() as m:
+        _crash_after(m, 4)  # Initial checkpoint + 3 intervals
+        with pytest.raises(Preempted):
+            run_checkpointed(PARAMS, 1000, str(tmp_path / 'cut.ckpt'), interval=100, rng=fresh_rng())
+    resumed = resume(str(tmp_path / 'cut.ckpt'))
+    for name, values in expected.items():
+        np.testing.assert_array_equal(resumed[name], values)
+
+def test_resume_from_another_directory(tmp_path, monkeypatch):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'elsewhere').mkdir()
+    monkeypatch.chdir(tmp_path)
+    with monkeypatch.context() as m:
+        _crash_after(m, 2)
+        with pytest.raises(Preempted):
+            run_checkpointed(PARAMS, 300, os.path.join('sub', 'ck'), interval=100, rng=1)
+    monkeypatch.chdir(tmp_path / 'elsewhere')
+    resumed = resume(str(tmp_path / 'sub' / 'ck'))
+    assert len(resumed['value']) == 300 and np.all(resumed['value'] != 0)
+
+def test_schedules_rejected_before_files_are_created(tmp_path):
+    path = str(tmp_path / 'ck')
+    with pytest.raises(ValueError):
+        run_checkpointed(PARAMS, 10, path, growth_rate=np.full(10, 0.01))
+    with pytest.raises(ValueError):
+        run_checkpointed(PARAMS, 10, path, sign=['+', '-'] * 5)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,33 @@
+import pytest
+
+from spiral_engine import SpiralEngine
+from spiral_provenance import RingBufferProvenance
+
+PARAMS = (10.0, 2.0, 5.0, 3.0, 1.0, 2.0)
+
+def test_ring_buffer_rejects_empty_capacity():
+    with pytest.raises(ValueError, match="capacity"):
+        RingBufferProvenance(capacity=0)
+
+def test_legacy_log_is_deprecated_and_resets_through_backend():
+    engine = SpiralEngine()
+    engine.compute_path(*PARAMS)
+    with pytest.warns(DeprecationWarning):
+        log = engine.log
+    assert len(log) == 1 and not hasattr(log, 'append')
+    with pytest.warns(DeprecationWarning):
+        engine.log = []
+    assert engine.get_provenance() == []
+    with pytest.raises(ValueError):
+        engine.log = [{'cycle': 1}]
+    engine.compute_path(*PARAMS)
+    engine.clear_log()
+    assert len(engine.provenance) == 0 and engine.provenance.cursor == 0
+
+def test_schedule_length_must_match_iterations():
+    params = dict(zip(('td', 'rf', 'tw', 'cir', 'am', 'da'), PARAMS))
+    engine = SpiralEngine()
+    with pytest.raises(ValueError, match="schedule length != iterations"):
+        engine.simulate_spiral_deterministic(params, iterations=3, growth_rate=[0.01] * 5)
+    with pytest.raises(ValueError, match="schedule length != iterations"):
+        engine.simulate_ensemble(params, 4, iterations=3, sign=['+', '-'], rng=0)
@@ -0,0 +1,24 @@
+import numpy as np
+
+import tavis_spiral
+
+PARAMS = {
+    'omega_0': 1.0, 'omega_c': 1.0, 'g_base': 0.2, 'T': 20.0, 'D': 1.5,
+    'omega': 2 * np.pi, 'lambda_decay': 0.1, 'C': 0.5, 'hbar': 1.0,
+    'n_times': 500, 'num_atoms': 2
+}
+
+def test_multi_atom_cav_dim_defaults_to_three():
+    res = tavis_spiral.simulate_rabi_spiral(PARAMS)
+    explicit = tavis_spiral.simulate_rabi_spiral(dict(PARAMS, cav_dim=3))
+    np.testing.assert_array_equal(res['n'], explicit['n'])
+    assert abs(res['std_n'] - 0.599) < 1e-3
+
+def test_jc_exact_matches_constant_coupling_run():
+    for num_atoms in (1, 2):
+        params = dict(PARAMS, omega=0.0, num_atoms=num_atoms, rtol=1e-10, atol=1e-12)
+        res = tavis_spiral.simulate_rabi_spiral(params)
+        P_e, P_ee, n = tavis_spiral.jc_exact(params, res['tlist'])
+        np.testing.assert_allclose(res['P_single_e'], P_e, atol=1e-6)
+        np.testing.assert_allclose(res['n'], n, atol=1e-6)
+        assert (P_ee is None) == (num_atoms == 1)
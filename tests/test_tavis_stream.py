@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+import tavis_spiral
+import tavis_stream
+
+PARAMS = {
+    'omega_0': 1.0, 'omega_c': 1.0, 'g_base': 0.2, 'T': 20.0, 'D': 1.5,
+    'omega': 2 * np.pi, 'lambda_decay': 0.1, 'C': 0.5, 'hbar': 1.0,
+    'cav_dim': 5, 'num_atoms': 2, 'spiral_mode': True
+}
+
+@pytest.mark.parametrize('T, n_times', [(20.0, 1), (20.0, 2), (20.0, 500), (0.3, 997), (200.0, 10_001)])
+def test_window_times_match_linspace(T, n_times):
+    tlist = np.linspace(0, T, n_times)
+    for window in (1, 7, 100, n_times):
+        for first in range(0, n_times, window):
+            stop = min(first + window, n_times)
+            np.testing.assert_array_equal(tavis_stream._window_times(T, n_times, first, stop), tlist[first:stop])
+
+@pytest.mark.parametrize('solver', ['RK45', 'propagator'])
+@pytest.mark.parametrize('n_times', [1, 2, 500])
+def test_streaming_matches_in_memory(tmp_path, solver, n_times):
+    params = dict(PARAMS, n_times=n_times, solver=solver)
+    full = tavis_spiral.simulate_rabi_spiral(params)
+    streamed = tavis_stream.simulate_rabi_streaming(params, str(tmp_path), window=64)
+    np.testing.assert_array_equal(streamed['tlist'], full['tlist'])
+    for key in ('P_single_e', 'P_ee', 'n'):
+        if solver == 'propagator':
+            np.testing.assert_array_equal(streamed[key], full[key])  # Piecewise-exact steps: bit for bit
+        else:
+            np.testing.assert_allclose(streamed[key], full[key], atol=1e-5)  # RK45 restarts at window edges
+    assert streamed['std_n'] == pytest.approx(full['std_n'], abs=1e-5)
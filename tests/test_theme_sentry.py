@@ -0,0 +1,61 @@
+import random
+import re
+
+import theme_sentry
+
+def classify_original(text):
+    """classify_input as it was before the combined TriggerMatcher (one re.search per trigger)."""
+    t = text.lower()
+    if any(re.search(p, t) for p in theme_sentry.BLOCKED_TRIGGERS):
+        return ("blocked", "Holy-war/ideological theme", "See CONTEXT_STRING_GUIDELINES.md §3.1")
+    play_score = sum(bool(re.search(p, t)) for p in theme_sentry.PLAY_TRIGGERS)
+    work_score = sum(k in t for k in theme_sentry.WORK_TRIGGERS)
+    if play_score > 0 and work_score == 0:
+        return ("play", "Narrative theme", "playground/dune/")
+    elif work_score > 0 and play_score == 0:
+        return ("work", "Scientific inquiry", "core_tricorder")
+    elif play_score > 0 and work_score > 0:
+        return ("mixed", "Mixed themes", "SPLIT: work + play logs")
+    return ("work", "Default: assume inquiry", "core_tricorder")
+
+def reference_counts(t):
+    return {'blocked': sum(bool(re.search(p, t)) for p in theme_sentry.BLOCKED_TRIGGERS),
+            'play': sum(bool(re.search(p, t)) for p in theme_sentry.PLAY_TRIGGERS),
+            'work': sum(k in t for k in theme_sentry.WORK_TRIGGERS)}
+
+def as_tuple(signal):
+    return (signal.type, signal.reason, signal.redirect)
+
+# Trigger fragments, near misses, case variants and odd characters
+WORDS = ["spice must flow", "kangaroo mouse", "Lady Liberty", "lady liberty", "muad'dib", "MuadDib", "shai-hulud",
+         "shaihulud", "jihad", "crusade", "crusader", "manifest destiny", "right", "alright", "hypothesis", "fidelity",
+         "spiral path", "doi", "doing", "audit", "tricorder", "helix", "the", "a", "of", "flow", "spice", "must",
+         "manifest", "destinyright", "jihadist", "xjihad", "Audit", "HELIX", ".", "\n", "'", "é"]
+
+def random_texts():
+    rng = random.Random(2)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))) for _ in range(200_000)]
+    texts += ["".join(rng.choice(WORDS) for _ in range(5)) for _ in range(5_000)]
+    return texts + ["", " ", "jihad", "Spice must flow and the hypothesis", "manifest destiny was right",
+                    "manifest destiny\nright"]
+
+def test_classify_matches_original_on_random_inputs():
+    texts = random_texts()
+    expected = [classify_original(t) for t in texts]
+    assert [as_tuple(theme_sentry.classify_input(t)) for t in texts] == expected
+    assert [as_tuple(s) for s in theme_sentry.classify_batch(texts)] == expected
+
+def test_counts_match_per_trigger_search():
+    matcher = theme_sentry.trigger_matcher()
+    for text in random_texts()[:30_000]:
+        t = text.lower()
+        assert matcher.counts(t) == reference_counts(t)
+
+def test_uncombinable_triggers_are_searched_on_their_own(monkeypatch):
+    # A backreference and a global inline flag can't join the shared alternation
+    monkeypatch.setattr(theme_sentry, 'PLAY_TRIGGERS', theme_sentry.PLAY_TRIGGERS + [r"(spice)\s+\1", r"(?s)sand.worm"])
+    matcher = theme_sentry.trigger_matcher()
+    assert matcher.always
+    for text in ["spice  spice", "sand\nworm", "spice spice and the audit", "nothing here", "jihad spice spice"]:
+        assert matcher.counts(text) == reference_counts(text)
+        assert as_tuple(theme_sentry.classify_input(text)) == classify_original(text)